@@ -15,12 +15,12 @@ from __future__ import annotations
 import asyncio
 import json
 import subprocess
+import tomllib
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import httpx
-import toml
 
 from config.manager import ConfigManager
 from i18n.manager import _
@@ -610,7 +610,7 @@ class AgentManager:
             cmd = f"sudo cp {service_file} {target_path}"
             process = await asyncio.create_subprocess_shell(
                 cmd,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
 
@@ -655,7 +655,7 @@ class AgentManager:
             cmd = "sudo systemctl daemon-reload"
             process = await asyncio.create_subprocess_shell(
                 cmd,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
 
@@ -782,9 +782,9 @@ class AgentManager:
             status_process = await asyncio.create_subprocess_shell(
                 status_cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
             )
-            stdout, _ = await status_process.communicate()
+            stdout, _stderr = await status_process.communicate()
             status = stdout.decode("utf-8").strip() if stdout else ""
 
             # 如果服务正在运行，静默停止它
@@ -792,8 +792,8 @@ class AgentManager:
                 stop_cmd = f"sudo systemctl stop {service_name}"
                 await asyncio.create_subprocess_shell(
                     stop_cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
                 )
         except (OSError, subprocess.SubprocessError):
             # 静默忽略任何错误
@@ -877,7 +877,7 @@ class AgentManager:
             process = await asyncio.create_subprocess_shell(
                 cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
             )
 
             stdout, _stderr = await process.communicate()
@@ -1143,8 +1143,8 @@ class AgentManager:
             return []
 
         try:
-            with self.app_config_path.open(encoding="utf-8") as f:
-                config_data = toml.load(f)
+            with self.app_config_path.open("rb") as f:
+                config_data = tomllib.load(f)
 
             applications = config_data.get("applications", [])
             if not applications:
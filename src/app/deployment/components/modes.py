@@ -8,8 +8,12 @@ from __future__ import annotations
 
 import asyncio
 import os
+import re
+import time
 import webbrowser
-from typing import TYPE_CHECKING, Any, ClassVar
+from functools import partial
+from typing import TYPE_CHECKING, ClassVar
+from urllib.parse import urlsplit
 
 from textual import on
 from textual.binding import Binding
@@ -29,22 +33,27 @@ from . import EnvironmentCheckScreen
 
 if TYPE_CHECKING:
     from textual.app import ComposeResult
-    from textual.events import Focus
+
+# 进程的有效用户在运行期间不会改变，导入时检测一次即可
+IS_ROOT = hasattr(os, "geteuid") and os.geteuid() == 0
+
+# 服务 URL 至少要形如 http(s)://host，才值得发起连接验证
+SERVICE_URL_PATTERN = re.compile(r"^https?://[^\s/]+")
+MIN_SERVICE_URL_LENGTH = 10
+
+# 授权 URL 缓存有效期（秒），用户关闭浏览器后重试时无需再次请求后端
+AUTH_URL_CACHE_TTL = 60.0
 
 
 class ModeOptionButton(Button):
     """自定义的模式选择按钮，禁用文字高亮"""
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        """初始化自定义按钮"""
-        super().__init__(*args, **kwargs)
-        # 禁用默认的文字样式
-        self.styles.text_style = "none"
-
-    def _on_focus(self, event: Focus) -> None:
-        """覆盖焦点事件，禁用文字高亮"""
-        super()._on_focus(event)
-        self.styles.text_style = "none"
+    # 按钮在焦点、悬停等状态下都会设置 text-style，用 !important 统一禁用
+    DEFAULT_CSS = """
+    ModeOptionButton {
+        text-style: none !important;
+    }
+    """
 
 
 class InitializationModeScreen(ModalScreen[bool]):
@@ -125,34 +134,6 @@ class ConnectExistingServiceScreen(ModalScreen[bool]):
     允许用户输入现有 openEuler Intelligence 服务的连接信息。
     """
 
-    CSS = """
-    .form-row {
-        height: 3;
-        margin: 1 0;
-        align: left middle;
-    }
-
-    .form-label {
-        color: #4963b1;
-        text-style: bold;
-        width: 20;
-        content-align: left middle;
-        padding-right: 1;
-        padding-top: 1;
-    }
-
-    .form-input {
-        width: 1fr;
-        margin-left: 1;
-    }
-
-    .get-api-key-button {
-        width: auto;
-        min-width: 10;
-        margin: 0 1;
-    }
-    """
-
     BINDINGS: ClassVar = [
         Binding("escape", "back", _("返回")),
         Binding("ctrl+q", "app.quit", _("退出")),
@@ -163,7 +144,14 @@ class ConnectExistingServiceScreen(ModalScreen[bool]):
         super().__init__()
         self.validation_task: asyncio.Task[None] | None = None
         self.is_validated = False
-        self.callback_server: CallbackServer | None = None
+        # 最近一次写入状态栏的文本，用于跳过内容未变化的刷新
+        self._last_status: str | None = None
+        # 最近一次验证通过的 (URL, Token)，连接时直接复用
+        self._last_validated_inputs: tuple[str, str] | None = None
+        # 回调服务器在屏幕生命周期内复用，重复获取 API Key 时无需重新绑定端口
+        self.callback_server = CallbackServer()
+        # 授权 URL 缓存：规范化的服务 URL -> (获取时间, 授权 URL, 登录令牌)
+        self._auth_url_cache: dict[str, tuple[float, str, str | None]] = {}
         self.login_task: asyncio.Task[None] | None = None
         self.logger = get_logger(__name__)
         self.browser_available = is_browser_available()
@@ -238,13 +226,25 @@ class ConnectExistingServiceScreen(ModalScreen[bool]):
         if self.validation_task and not self.validation_task.done():
             self.validation_task.cancel()
 
+        # 输入已变化，之前的验证结果立即失效，避免保存过期配置
+        self.is_validated = False
+        self._last_validated_inputs = None
+
+        # 每个事件只读取一次输入值
+        try:
+            url = self.query_one("#service_url", Input).value.strip()
+            self.query_one("#connect", Button).disabled = True
+        except (AttributeError, ValueError):
+            return
+
         # 更新"获取 API Key"按钮状态
-        self._update_get_api_key_button()
+        self._update_get_api_key_button(url)
 
         # 检查是否需要验证
-        if self._should_validate():
+        if self._should_validate(url):
             # 延迟验证，避免频繁触发
             self.validation_task = asyncio.create_task(self._delayed_validation())
+            self.validation_task.add_done_callback(partial(self._release_task, "validation_task"))
 
     @on(Button.Pressed, "#get_api_key")
     async def on_get_api_key_pressed(self) -> None:
@@ -270,26 +270,26 @@ class ConnectExistingServiceScreen(ModalScreen[bool]):
 
             # 显示状态
             status_widget = self.query_one("#validation_status", Static)
-            status_widget.update(_("[yellow]正在获取授权 URL...[/yellow]"))
+            self._set_status(status_widget, _("[yellow]正在获取授权 URL...[/yellow]"))
 
             # 获取授权 URL
-            auth_url, _token = get_auth_url(url)
+            auth_url, _token = self._get_auth_url_cached(url)
             if not auth_url:
-                status_widget.update(_("[red]✗ 获取授权 URL 失败[/red]"))
+                self._set_status(status_widget, _("[red]✗ 获取授权 URL 失败[/red]"))
                 get_api_key_btn.disabled = False
                 return
 
-            # 启动回调服务器
-            self.callback_server = CallbackServer()
+            # 启动（或复用）回调服务器
             launcher_url = self.callback_server.start(auth_url)
 
             # 更新状态并打开浏览器
-            status_widget.update(_("[yellow]正在打开浏览器登录...[/yellow]"))
+            self._set_status(status_widget, _("[yellow]正在打开浏览器登录...[/yellow]"))
             webbrowser.open(launcher_url)
             self.notify(_("已打开浏览器，请完成登录"), severity="information")
 
             # 异步等待登录完成
             self.login_task = asyncio.create_task(self._wait_for_login())
+            self.login_task.add_done_callback(partial(self._release_task, "login_task"))
 
         except (OSError, RuntimeError, ValueError) as e:
             self.logger.exception("获取 API Key 失败")
@@ -303,20 +303,22 @@ class ConnectExistingServiceScreen(ModalScreen[bool]):
     @on(Button.Pressed, "#connect")
     async def on_connect_pressed(self) -> None:
         """处理连接按钮点击"""
-        if not self.is_validated:
+        if not self.is_validated or self._last_validated_inputs is None:
             self.notify(_("请等待连接验证完成"), severity="warning")
             return
 
         try:
-            # 获取输入值
-            url = self.query_one("#service_url", Input).value.strip()
-            token = self.query_one("#access_token", Input).value.strip()
+            # 复用最近一次验证通过的输入值
+            url, token = self._last_validated_inputs
 
             # 保存配置
             await self._save_configuration(url, token)
 
             # 显示成功信息
             self.notify(_("配置已保存，初始化完成！"), severity="information")
+
+            # 退出前停止回调服务器，避免登录页面在本地继续可访问
+            await self._cleanup()
             self.app.exit()
 
         except (OSError, RuntimeError, ValueError) as e:
@@ -341,19 +343,29 @@ class ConnectExistingServiceScreen(ModalScreen[bool]):
 
     # ==================== 验证相关的私有方法 ====================
 
-    def _should_validate(self) -> bool:
-        """检查是否应该进行验证"""
+    @staticmethod
+    def _should_validate(url: str) -> bool:
+        """检查是否应该对给定的服务 URL 进行验证"""
+        # 只需要 URL 有效即可进行验证，Token 是可选的
+        # 明显不完整的 URL 直接跳过，避免无意义的网络请求
+        if len(url) < MIN_SERVICE_URL_LENGTH or not SERVICE_URL_PATTERN.match(url):
+            return False
         try:
-            url = self.query_one("#service_url", Input).value.strip()
-            # 只需要 URL 不为空即可进行验证，Token 是可选的
-            return bool(url)
-        except (AttributeError, ValueError):
+            parts = urlsplit(url)
+        except ValueError:
             return False
+        return parts.scheme in {"http", "https"} and bool(parts.netloc)
+
+    def _set_status(self, status_widget: Static, text: str) -> None:
+        """更新验证状态文本，内容未变化时不触发刷新"""
+        if text == self._last_status:
+            return
+        status_widget.update(text)
+        self._last_status = text
 
-    def _update_get_api_key_button(self) -> None:
+    def _update_get_api_key_button(self, url: str) -> None:
         """更新获取 API Key 按钮的状态"""
         try:
-            url = self.query_one("#service_url", Input).value.strip()
             get_api_key_btn = self.query_one("#get_api_key", Button)
             # 只有在浏览器可用且 URL 有效时才启用按钮
             get_api_key_btn.disabled = not (self.browser_available and bool(url))
@@ -372,33 +384,36 @@ class ConnectExistingServiceScreen(ModalScreen[bool]):
         """验证连接"""
         status_widget = self.query_one("#validation_status", Static)
         connect_button = self.query_one("#connect", Button)
+        url = self.query_one("#service_url", Input).value.strip()
+        token = self.query_one("#access_token", Input).value.strip()
 
-        # 更新状态为验证中
-        status_widget.update(_("[yellow]验证连接中...[/yellow]"))
-        connect_button.disabled = True
-        self.is_validated = False
+        # 更新状态为验证中（合并为一次界面刷新）
+        with self.app.batch_update():
+            self._set_status(status_widget, _("[yellow]验证连接中...[/yellow]"))
+            connect_button.disabled = True
+            self.is_validated = False
+            self._last_validated_inputs = None
 
         try:
-            # 获取输入值
-            url = self.query_one("#service_url", Input).value.strip()
-            token = self.query_one("#access_token", Input).value.strip()
-
             # 执行连接验证
             is_valid, message = await validate_oi_connection(url, token)
 
-            if is_valid:
-                status_widget.update(_("[green]✓ {message}[/green]").format(message=message))
-                connect_button.disabled = False
-                self.is_validated = True
-            else:
-                status_widget.update(_("[red]✗ {message}[/red]").format(message=message))
-                connect_button.disabled = True
-                self.is_validated = False
+            with self.app.batch_update():
+                if is_valid:
+                    self._set_status(status_widget, _("[green]✓ {message}[/green]").format(message=message))
+                    connect_button.disabled = False
+                    self.is_validated = True
+                    self._last_validated_inputs = (url, token)
+                else:
+                    self._set_status(status_widget, _("[red]✗ {message}[/red]").format(message=message))
+                    connect_button.disabled = True
+                    self.is_validated = False
 
         except (OSError, RuntimeError, ValueError) as e:
-            status_widget.update(_("[red]✗ 验证异常: {error}[/red]").format(error=e))
-            connect_button.disabled = True
-            self.is_validated = False
+            with self.app.batch_update():
+                self._set_status(status_widget, _("[red]✗ 验证异常: {error}[/red]").format(error=e))
+                connect_button.disabled = True
+                self.is_validated = False
 
     # ==================== Web 登录相关的私有方法 ====================
 
@@ -408,15 +423,9 @@ class ConnectExistingServiceScreen(ModalScreen[bool]):
         get_api_key_btn = self.query_one("#get_api_key", Button)
 
         try:
-            if not self.callback_server:
-                return
-
             # 等待认证结果（超时 5 分钟）
-            status_widget.update(_("[yellow]等待登录完成...[/yellow]"))
-            auth_result = await asyncio.to_thread(
-                self.callback_server.wait_for_auth,
-                timeout=300,
-            )
+            self._set_status(status_widget, _("[yellow]等待登录完成...[/yellow]"))
+            auth_result = await self.callback_server.wait_for_auth_async(timeout=300)
 
             # 处理认证结果
             result_type = auth_result.get("type")
@@ -425,84 +434,127 @@ class ConnectExistingServiceScreen(ModalScreen[bool]):
                 session_id = auth_result.get("sessionId")
                 if session_id:
                     # 将 session_id 填入 Access Token 输入框
-                    token_input = self.query_one("#access_token", Input)
-                    token_input.value = session_id
-
-                    status_widget.update(_("[green]✓ 登录成功，已获取 API Key[/green]"))
+                    with self.app.batch_update():
+                        token_input = self.query_one("#access_token", Input)
+                        token_input.value = session_id
+                        self._set_status(status_widget, _("[green]✓ 登录成功，已获取 API Key[/green]"))
                     self.logger.info("浏览器登录成功，已获取 API Key")
 
                     # 自动触发验证
                     await self._validate_connection()
                 else:
-                    status_widget.update(_("[red]✗ 登录失败：未收到 session ID[/red]"))
-                    get_api_key_btn.disabled = False
+                    with self.app.batch_update():
+                        self._set_status(status_widget, _("[red]✗ 登录失败：未收到 session ID[/red]"))
+                        get_api_key_btn.disabled = False
 
             elif result_type == "error":
                 error_desc = auth_result.get("error_description", "未知错误")
-                status_widget.update(_("[red]✗ 登录失败: {error}[/red]").format(error=error_desc))
-                get_api_key_btn.disabled = False
+                with self.app.batch_update():
+                    self._set_status(status_widget, _("[red]✗ 登录失败: {error}[/red]").format(error=error_desc))
+                    get_api_key_btn.disabled = False
 
             else:
-                status_widget.update(_("[red]✗ 登录失败：未知结果[/red]"))
-                get_api_key_btn.disabled = False
+                with self.app.batch_update():
+                    self._set_status(status_widget, _("[red]✗ 登录失败：未知结果[/red]"))
+                    get_api_key_btn.disabled = False
 
         except asyncio.CancelledError:
             self.logger.info("登录任务被取消")
-            status_widget.update(_("[yellow]登录已取消[/yellow]"))
-            get_api_key_btn.disabled = False
+            with self.app.batch_update():
+                self._set_status(status_widget, _("[yellow]登录已取消[/yellow]"))
+                get_api_key_btn.disabled = False
         except (OSError, RuntimeError, ValueError) as e:
             self.logger.exception("等待登录时发生错误")
-            status_widget.update(_("[red]✗ 登录异常: {error}[/red]").format(error=e))
-            get_api_key_btn.disabled = False
-        finally:
-            # 清理回调服务器
-            if self.callback_server:
-                self.callback_server.stop()
-                self.callback_server = None
+            with self.app.batch_update():
+                self._set_status(status_widget, _("[red]✗ 登录异常: {error}[/red]").format(error=e))
+                get_api_key_btn.disabled = False
+
+    def _get_auth_url_cached(self, url: str) -> tuple[str | None, str | None]:
+        """获取授权 URL，短时间内对同一服务的重复请求直接使用缓存结果"""
+        key = url.rstrip("/").lower()
+        now = time.monotonic()
+
+        cached = self._auth_url_cache.get(key)
+        if cached and now - cached[0] < AUTH_URL_CACHE_TTL:
+            return cached[1], cached[2]
+
+        auth_url, token = get_auth_url(url)
+        if auth_url:
+            self._auth_url_cache[key] = (now, auth_url, token)
+        else:
+            self._auth_url_cache.pop(key, None)
+        return auth_url, token
 
     # ==================== 配置保存相关的私有方法 ====================
 
     async def _save_configuration(self, url: str, token: str) -> None:
         """保存连接配置"""
         try:
-            # 更新当前用户配置
-            config_manager = ConfigManager()
-            config_manager.set_eulerintelli_url(url)
-            config_manager.set_eulerintelli_key(token)
-            config_manager.set_backend(Backend.EULERINTELLI)
+            # 配置读写为同步磁盘 I/O，放到工作线程中执行，避免阻塞界面
+            template_created = await asyncio.to_thread(self._do_save_config, url, token)
+        except (OSError, RuntimeError, ValueError):
+            self.logger.exception("保存配置时发生错误")
+            raise
 
-            self.logger.info("用户配置已保存: URL=%s", url)
+        self.logger.info("用户配置已保存: URL=%s", url)
 
-            # 如果是 root 用户，从用户配置创建全局模板
-            is_root = os.geteuid() == 0
-            if is_root:
-                self.logger.info("检测到 root 用户，创建全局配置模板")
+        if template_created is None:
+            return
 
-                deployment_manager = ConfigManager.create_deployment_manager()
+        self.logger.info("检测到 root 用户，已从用户配置创建全局配置模板")
+        if template_created:
+            self.logger.info("全局配置模板创建成功")
+        else:
+            self.logger.warning("创建全局配置模板失败，但用户配置已保存")
 
-                config_dict = config_manager.data.to_dict()
-                deployment_manager.data = ConfigModel.from_dict(config_dict)
+    def _do_save_config(self, url: str, token: str) -> bool | None:
+        """
+        同步保存连接配置（在工作线程中执行）
 
-                if deployment_manager.create_global_template():
-                    self.logger.info("全局配置模板创建成功")
-                else:
-                    self.logger.warning("创建全局配置模板失败，但用户配置已保存")
+        Returns:
+            root 用户返回全局配置模板是否创建成功，非 root 用户返回 None
 
-        except (OSError, RuntimeError, ValueError):
-            self.logger.exception("保存配置时发生错误")
-            raise
+        """
+        # 更新当前用户配置
+        config_manager = ConfigManager()
+        config_manager.set_eulerintelli_url(url)
+        config_manager.set_eulerintelli_key(token)
+        config_manager.set_backend(Backend.EULERINTELLI)
+
+        # 如果是 root 用户，从用户配置创建全局模板
+        if not IS_ROOT:
+            return None
+
+        deployment_manager = ConfigManager.create_deployment_manager()
+
+        config_dict = config_manager.data.to_dict()
+        deployment_manager.data = ConfigModel.from_dict(config_dict)
+
+        return deployment_manager.create_global_template()
 
     # ==================== 资源清理相关的私有方法 ====================
 
     async def _cleanup(self) -> None:
         """清理资源"""
+        # 取消尚未完成的延迟验证任务，避免离开屏幕后继续发起网络请求
+        pending = False
+        if self.validation_task and not self.validation_task.done():
+            self.validation_task.cancel()
+            pending = True
+
         # 取消登录任务
         if self.login_task and not self.login_task.done():
             self.login_task.cancel()
+            pending = True
+
+        if pending:
             # 等待任务取消完成，忽略 CancelledError
             await asyncio.sleep(0)
 
         # 停止回调服务器
-        if self.callback_server:
-            self.callback_server.stop()
-            self.callback_server = None
+        self.callback_server.stop()
+
+    def _release_task(self, attr: str, task: asyncio.Task[None]) -> None:
+        """任务结束后释放对它的引用；若属性已指向新任务则保持不变"""
+        if getattr(self, attr) is task:
+            setattr(self, attr, None)
@@ -6,19 +6,48 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import StrEnum
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from i18n.manager import _
-from tool.validators import APIValidator
+
+if TYPE_CHECKING:
+    from tool.validators import APIValidator
 
 # 常量定义
 MAX_TEMPERATURE = 10.0
 MIN_TEMPERATURE = 0.0
-
-
-class AgentInitStatus(Enum):
+# 内存中保留的最大日志行数，超出后自动丢弃最早的日志
+MAX_LOG_LINES = 5000
+# 连接性验证成功结果的缓存有效期（秒）
+PROBE_CACHE_TTL = 30.0
+# 连接性验证的默认超时时间（秒），与模型推理使用的 request_timeout 相互独立
+DEFAULT_PROBE_TIMEOUT = 30.0
+
+# ANSI 颜色码到 Rich 标记的替换表，均为固定字面量，使用 str.replace 即可
+_ANSI_REPLACEMENTS = (
+    ("\033[0;34m", "[blue]"),  # 蓝色 (BLUE 变量)
+    ("\033[0;32m", "[green]"),  # 绿色 (GREEN 变量)
+    ("\033[0;31m", "[red]"),  # 红色 (RED 变量)
+    ("\033[0;33m", "[yellow]"),  # 黄色 (YELLOW 变量)
+    ("\033[34m", "[blue]"),  # 蓝色信息
+    ("\033[32m", "[green]"),  # 绿色成功
+    ("\033[31m", "[red]"),  # 红色错误
+    ("\033[33m", "[yellow]"),  # 黄色警告
+    ("\033[0m", "[/]"),  # 重置颜色
+)
+# Rich 颜色开始标记（捕获颜色名）或结束标记 [/]
+_RICH_TAG_RE = re.compile(r"\[(blue|green|red|yellow)\]|\[/\]")
+
+
+class AgentInitStatus(StrEnum):
     """智能体初始化状态"""
 
     SUCCESS = "success"  # 成功完成
@@ -26,7 +55,7 @@ class AgentInitStatus(Enum):
     FAILED = "failed"  # 失败（其他错误）
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMConfig:
     """
     LLM 配置
@@ -39,10 +68,15 @@ class LLMConfig:
     model: str = ""
     max_tokens: int = 8192
     temperature: float = 0.7
-    request_timeout: int = 300
+    request_timeout: int = 300  # 模型推理请求的超时时间（秒）
+    probe_timeout_s: float = DEFAULT_PROBE_TIMEOUT  # 连接性验证的超时时间（秒）
 
+    def as_key(self) -> tuple[str, str, str, float]:
+        """返回影响连接性验证结果的字段，可作为验证结果的缓存键"""
+        return (self.endpoint, self.api_key, self.model, self.probe_timeout_s)
 
-@dataclass
+
+@dataclass(slots=True)
 class EmbeddingConfig:
     """
     Embedding 配置
@@ -54,9 +88,14 @@ class EmbeddingConfig:
     endpoint: str = ""
     api_key: str = ""
     model: str = ""
+    probe_timeout_s: float = DEFAULT_PROBE_TIMEOUT  # 连接性验证的超时时间（秒）
+
+    def as_key(self) -> tuple[str, str, str, float]:
+        """返回影响连接性验证结果的字段，可作为验证结果的缓存键"""
+        return (self.endpoint, self.api_key, self.model, self.probe_timeout_s)
 
 
-@dataclass
+@dataclass(slots=True)
 class DeploymentConfig:
     """
     部署配置
@@ -80,6 +119,17 @@ class DeploymentConfig:
     # 检测到的后端类型（从 API 验证中获得）
     detected_backend_type: str = "function_call"  # 默认值
 
+    # 所有配置共享的 API 验证器实例，首次使用时创建
+    _validator: ClassVar[APIValidator | None] = None
+
+    # 连接性验证成功结果缓存: 验证参数 -> (缓存时间, 验证结果)
+    _probe_cache: dict[tuple[Any, ...], tuple[float, tuple[bool, str, dict]]] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
     def validate(self) -> tuple[bool, list[str]]:
         """
         验证配置的有效性
@@ -88,18 +138,18 @@ class DeploymentConfig:
             tuple[bool, list[str]]: (是否有效, 错误消息列表)
 
         """
-        errors = []
+        errors: list[str] = []
 
         # 验证 LLM 字段
-        errors.extend(self._validate_llm_fields())
+        self._validate_llm_fields(errors)
 
         # 验证 Embedding 字段
-        errors.extend(self._validate_embedding_fields())
+        self._validate_embedding_fields(errors)
 
         # 验证数值范围
-        errors.extend(self._validate_numeric_fields())
+        self._validate_numeric_fields(errors)
 
-        return len(errors) == 0, errors
+        return not errors, errors
 
     async def validate_llm_connectivity(self) -> tuple[bool, str, dict]:
         """
@@ -116,13 +166,17 @@ class DeploymentConfig:
         if not self.llm.endpoint.strip():
             return False, _("LLM API 端点不能为空"), {}
 
-        validator = APIValidator()
-        llm_valid, llm_msg, llm_info = await validator.validate_llm_config(
-            self.llm.endpoint,
-            self.llm.api_key,  # 允许为空
-            self.llm.model,  # 允许为空
-            self.llm.request_timeout,
-        )
+        key = ("llm", *self.llm.as_key())
+        result = self._get_cached_probe(key)
+        if result is None:
+            result = await self._get_validator().validate_llm_config(
+                self.llm.endpoint,
+                self.llm.api_key,  # 允许为空
+                self.llm.model,  # 允许为空
+                self.llm.probe_timeout_s,
+            )
+            self._store_probe(key, result)
+        llm_valid, llm_msg, llm_info = result
 
         # 如果验证成功，保存检测到的后端类型
         if llm_valid and llm_info.get("supports_function_call", False):
@@ -145,13 +199,17 @@ class DeploymentConfig:
         if not self.embedding.endpoint.strip():
             return False, _("Embedding API 端点不能为空"), {}
 
-        validator = APIValidator()
-        embed_valid, embed_msg, embed_info = await validator.validate_embedding_config(
-            self.embedding.endpoint,
-            self.embedding.api_key,  # 允许为空
-            self.embedding.model,  # 允许为空
-            self.llm.request_timeout,  # 使用相同的超时设置
-        )
+        key = ("embedding", *self.embedding.as_key())
+        result = self._get_cached_probe(key)
+        if result is None:
+            result = await self._get_validator().validate_embedding_config(
+                self.embedding.endpoint,
+                self.embedding.api_key,  # 允许为空
+                self.embedding.model,  # 允许为空
+                self.embedding.probe_timeout_s,
+            )
+            self._store_probe(key, result)
+        embed_valid, embed_msg, embed_info = result
 
         # 如果验证成功，保存检测到的 embedding 类型
         if embed_valid and embed_info.get("type"):
@@ -161,40 +219,76 @@ class DeploymentConfig:
 
         return embed_valid, embed_msg, embed_info
 
-    def _validate_llm_fields(self) -> list[str]:
-        """验证 LLM 配置字段"""
-        errors = []
+    async def validate_connectivity_all(
+        self,
+    ) -> tuple[tuple[bool, str, dict], tuple[bool, str, dict]]:
+        """
+        并发验证 LLM 和 Embedding API 连接性
+
+        两个探测互不依赖，并发执行时总耗时取决于较慢的一个。
+
+        Returns:
+            tuple: (LLM 验证结果, Embedding 验证结果)，每项均为 (是否验证成功, 消息, 验证详细信息)
+
+        """
+        llm_result, embed_result = await asyncio.gather(
+            self.validate_llm_connectivity(),
+            self.validate_embedding_connectivity(),
+        )
+        return llm_result, embed_result
+
+    @classmethod
+    def _get_validator(cls) -> APIValidator:
+        """获取共享的 API 验证器实例"""
+        if cls._validator is None:
+            # 延迟导入，避免加载数据模型时引入 HTTP 相关依赖
+            from tool.validators import APIValidator  # noqa: PLC0415
+
+            cls._validator = APIValidator()
+        return cls._validator
+
+    def _get_cached_probe(self, key: tuple[Any, ...]) -> tuple[bool, str, dict] | None:
+        """获取未过期的连接性验证结果"""
+        cached = self._probe_cache.get(key)
+        if cached is None:
+            return None
+        cached_at, result = cached
+        if time.monotonic() - cached_at > PROBE_CACHE_TTL:
+            del self._probe_cache[key]
+            return None
+        return result
+
+    def _store_probe(self, key: tuple[Any, ...], result: tuple[bool, str, dict]) -> None:
+        """缓存连接性验证结果，失败结果可能是暂时性的，不缓存"""
+        if result[0]:
+            self._probe_cache[key] = (time.monotonic(), result)
+
+    def _validate_llm_fields(self, errors: list[str]) -> None:
+        """验证 LLM 配置字段，错误消息追加到 errors"""
         if not self.llm.endpoint.strip():
             errors.append(_("LLM API 端点不能为空"))
-        return errors
-
-    def _validate_embedding_fields(self) -> list[str]:
-        """验证 Embedding 配置字段"""
-        errors = []
-
-        # 检查是否有任何 Embedding 字段已填写
-        has_embedding_config = any(
-            [
-                self.embedding.endpoint.strip(),
-                self.embedding.api_key.strip(),
-                self.embedding.model.strip(),
-            ],
-        )
+
+    def _validate_embedding_fields(self, errors: list[str]) -> None:
+        """验证 Embedding 配置字段，错误消息追加到 errors"""
+        # 端点只检查一次，后续判断复用结果
+        endpoint = self.embedding.endpoint
+        has_endpoint = bool(endpoint and endpoint.strip())
 
         # 轻量部署模式下，Embedding 配置是可选的
         if self.deployment_mode == "light":
+            # 检查是否有任何 Embedding 字段已填写（遇到第一个非空字段即停止）
+            has_embedding_config = any(
+                value and value.strip() for value in (self.embedding.api_key, self.embedding.model)
+            )
             # 如果用户填了任何 Embedding 字段，则端点必须填写，API Key 和模型名称允许为空
-            if has_embedding_config and not self.embedding.endpoint.strip():
+            if has_embedding_config and not has_endpoint:
                 errors.append(_("Embedding API 端点不能为空"))
-        elif not self.embedding.endpoint.strip():
+        elif not has_endpoint:
             # 全量部署模式下，Embedding 配置是必需的，但只要求端点必填
             errors.append(_("Embedding API 端点不能为空"))
 
-        return errors
-
-    def _validate_numeric_fields(self) -> list[str]:
-        """验证数值字段"""
-        errors = []
+    def _validate_numeric_fields(self, errors: list[str]) -> None:
+        """验证数值字段，错误消息追加到 errors"""
         if self.llm.max_tokens <= 0:
             errors.append(_("LLM max_tokens 必须大于 0"))
         if not (MIN_TEMPERATURE <= self.llm.temperature <= MAX_TEMPERATURE):
@@ -206,10 +300,112 @@ class DeploymentConfig:
             )
         if self.llm.request_timeout <= 0:
             errors.append(_("LLM 请求超时时间必须大于 0"))
-        return errors
 
 
-@dataclass
+@lru_cache(maxsize=512)
+def _convert_and_balance(message: str) -> str:
+    """
+    将日志消息中的 ANSI 颜色码转换为平衡的 Rich 标记
+
+    纯函数，结果按原始消息缓存，重复的日志行（横幅、进度提示等）直接命中缓存。
+
+    Args:
+        message: 原始日志消息
+
+    Returns:
+        转换后的 Rich 标记文本
+
+    """
+    rich_message, count = _convert_shell_colors_to_rich(message)
+    # 只有实际引入了 Rich 标记时才需要检查标记平衡
+    if count:
+        rich_message = _ensure_balanced_rich_tags(rich_message)
+    return rich_message
+
+
+def _convert_shell_colors_to_rich(text: str) -> tuple[str, int]:
+    r"""
+    将 Shell ANSI 颜色码转换为 Textual Rich 标记
+
+    基于脚本中实际使用的颜色标记进行转换:
+    - COLOR_INFO='\033[34m'    # 蓝色信息 -> [blue]
+    - COLOR_SUCCESS='\033[32m' # 绿色成功 -> [green]
+    - COLOR_ERROR='\033[31m'   # 红色错误 -> [red]
+    - COLOR_WARNING='\033[33m' # 黄色警告 -> [yellow]
+    - COLOR_RESET='\033[0m'    # 重置颜色 -> [/]
+
+    转换结果中的标记可能不平衡，需要通过 `_ensure_balanced_rich_tags` 修复。
+
+    Args:
+        text: 包含 ANSI 颜色码的文本
+
+    Returns:
+        tuple[str, int]: (转换后的 Rich 标记文本, 替换的颜色码数量)
+
+    """
+    # 不含 ESC 字符时无需转换
+    if "\033" not in text:
+        return text, 0
+
+    result = text
+    for ansi_code, rich_markup in _ANSI_REPLACEMENTS:
+        result = result.replace(ansi_code, rich_markup)
+
+    # 被替换掉的 ESC 字符数即转换的颜色码数量
+    return result, text.count("\033") - result.count("\033")
+
+
+def _ensure_balanced_rich_tags(text: str) -> str:
+    """
+    确保 Rich 标记的平衡性，避免跨行导致的 MarkupError
+
+    处理以下情况：
+    1. 只有开始标记没有结束标记：自动添加结束标记
+    2. 只有结束标记没有开始标记：移除孤立的结束标记
+    3. 嵌套不当的标记：进行修复
+
+    Args:
+        text: 包含 Rich 标记的文本
+
+    Returns:
+        平衡的 Rich 标记文本
+
+    """
+    # 不含方括号即不含 Rich 标记，无需平衡
+    if "[" not in text:
+        return text
+
+    # 按文档顺序单次扫描所有开始/结束标记，结束标记统一为 [/]，只需记录未闭合的层数
+    open_depth = 0
+    parts: list[str] = []
+    last_pos = 0
+
+    for match in _RICH_TAG_RE.finditer(text):
+        # 添加匹配前的文本
+        parts.append(text[last_pos : match.start()])
+
+        if match.group(1) is not None:
+            # 开始标记：层数加一并添加到结果
+            open_depth += 1
+            parts.append(match.group(0))
+        elif open_depth:
+            # 有匹配的开始标记：层数减一并添加结束标记
+            open_depth -= 1
+            parts.append("[/]")
+        # 如果没有匹配的开始标记，忽略这个结束标记（不添加到结果中）
+
+        last_pos = match.end()
+
+    # 添加剩余的文本
+    parts.append(text[last_pos:])
+
+    # 为未闭合的开始标记添加结束标记
+    parts.append("[/]" * open_depth)
+
+    return "".join(parts)
+
+
+@dataclass(slots=True)
 class DeploymentState:
     """
     部署状态
@@ -224,7 +420,10 @@ class DeploymentState:
     is_completed: bool = False
     is_failed: bool = False
     error_message: str = ""
-    output_log: list[str] = field(default_factory=list)
+    output_log: deque[str] = field(default_factory=lambda: deque(maxlen=MAX_LOG_LINES))
+    # 累计添加的日志条数与已被界面取走的条数，用于增量读取新日志
+    _log_total: int = field(default=0, init=False, repr=False, compare=False)
+    _log_drained: int = field(default=0, init=False, repr=False, compare=False)
 
     def add_log(self, message: str) -> None:
         """
@@ -237,121 +436,35 @@ class DeploymentState:
 
         """
         # 转换 ANSI 颜色标记为 Textual 富文本标记
-        rich_message = self._convert_shell_colors_to_rich(message)
+        rich_message = _convert_and_balance(message)
 
         # 如果日志为空，或者新消息与最后一条消息不同，则添加
         if not self.output_log or self.output_log[-1] != rich_message:
             self.output_log.append(rich_message)
+            self._log_total += 1
 
-    def _convert_shell_colors_to_rich(self, text: str) -> str:
-        r"""
-        将 Shell ANSI 颜色码转换为 Textual Rich 标记
-
-        基于脚本中实际使用的颜色标记进行转换:
-        - COLOR_INFO='\033[34m'    # 蓝色信息 -> [blue]
-        - COLOR_SUCCESS='\033[32m' # 绿色成功 -> [green]
-        - COLOR_ERROR='\033[31m'   # 红色错误 -> [red]
-        - COLOR_WARNING='\033[33m' # 黄色警告 -> [yellow]
-        - COLOR_RESET='\033[0m'    # 重置颜色 -> [/]
-
-        处理跨行颜色标记，确保 Rich 标记的完整性，避免 MarkupError。
-
-        Args:
-            text: 包含 ANSI 颜色码的文本
-
-        Returns:
-            转换后的 Rich 标记文本
-
-        """
-        # ANSI 颜色码到 Rich 标记的映射
-        color_map = {
-            r"\033\[34m": "[blue]",  # 蓝色信息
-            r"\033\[32m": "[green]",  # 绿色成功
-            r"\033\[31m": "[red]",  # 红色错误
-            r"\033\[33m": "[yellow]",  # 黄色警告
-            r"\033\[0;32m": "[green]",  # 绿色 (GREEN 变量)
-            r"\033\[0;33m": "[yellow]",  # 黄色 (YELLOW 变量)
-            r"\033\[0;34m": "[blue]",  # 蓝色 (BLUE 变量)
-            r"\033\[0m": "[/]",  # 重置颜色
-        }
-
-        # 应用颜色转换
-        result = text
-        for ansi_code, rich_markup in color_map.items():
-            result = re.sub(ansi_code, rich_markup, result)
-
-        # 检查是否存在未配对的Rich标记，避免MarkupError
-        return self._ensure_balanced_rich_tags(result)
-
-    def _ensure_balanced_rich_tags(self, text: str) -> str:
+    def drain_new_logs(self) -> list[str]:
         """
-        确保 Rich 标记的平衡性，避免跨行导致的 MarkupError
+        取出自上次调用以来新增的日志
 
-        处理以下情况：
-        1. 只有开始标记没有结束标记：自动添加结束标记
-        2. 只有结束标记没有开始标记：移除孤立的结束标记
-        3. 嵌套不当的标记：进行修复
-
-        Args:
-            text: 包含 Rich 标记的文本
+        进度回调可能合并多次日志更新，界面通过该方法获取期间新增的全部日志，避免遗漏。
+        超出日志容量而被丢弃的旧条目不会返回。
 
         Returns:
-            平衡的 Rich 标记文本
+            list[str]: 按添加顺序排列的新日志
 
         """
-        close_pattern = r"\[/\]"
-        color_pattern = r"\[(blue|green|red|yellow)\]"
-
-        # 找到所有开始标记和结束标记，包含结束位置
-        open_matches = [
-            {"pos": match.start(), "end": match.end(), "type": "open", "tag": match.group(1)}
-            for match in re.finditer(color_pattern, text)
-        ]
-
-        close_matches = [
-            {"pos": match.start(), "end": match.end(), "type": "close", "tag": "close"}
-            for match in re.finditer(close_pattern, text)
-        ]
-
-        # 合并并按位置排序
-        all_matches = open_matches + close_matches
-        all_matches.sort(key=lambda x: x["pos"])
-
-        # 使用栈来跟踪标记平衡
-        open_stack = []
-        balanced_text = ""
-        last_pos = 0
-
-        for match in all_matches:
-            # 添加匹配前的文本
-            balanced_text += text[last_pos : match["pos"]]
-
-            if match["type"] == "open":
-                # 开始标记：入栈并添加到结果
-                open_stack.append(match["tag"])
-                balanced_text += f"[{match['tag']}]"
-            elif match["type"] == "close":
-                if open_stack:
-                    # 有匹配的开始标记：出栈并添加结束标记
-                    open_stack.pop()
-                    balanced_text += "[/]"
-                # 如果没有匹配的开始标记，忽略这个结束标记（不添加到结果中）
-
-            last_pos = match["end"]
-
-        # 添加剩余的文本
-        balanced_text += text[last_pos:]
-
-        # 为未闭合的开始标记添加结束标记
-        while open_stack:
-            balanced_text += "[/]"
-            open_stack.pop()
-
-        return balanced_text
+        count = min(self._log_total - self._log_drained, len(self.output_log))
+        self._log_drained = self._log_total
+        if count <= 0:
+            return []
+        return list(islice(reversed(self.output_log), count))[::-1]
 
     def clear_log(self) -> None:
         """清空日志"""
         self.output_log.clear()
+        self._log_total = 0
+        self._log_drained = 0
 
     def reset(self) -> None:
         """重置状态"""
@@ -8,14 +8,18 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import copy
+import os
 import platform
-import re
 import sys
+import tomllib
+from functools import cache, lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 import httpx
-import toml
+import tomli_w
 
 from config.manager import ConfigManager
 from i18n.manager import _
@@ -25,13 +29,170 @@ from .agent import AgentManager
 from .models import AgentInitStatus, DeploymentConfig, DeploymentState
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator, Callable
+    from collections.abc import AsyncGenerator, AsyncIterator, Callable
 
 logger = get_logger(__name__)
 
 
 LOCAL_DEPLOYMENT_HOST = "127.0.0.1"
 
+# 本地部署时写入 config.toml [login.settings] 的服务地址
+LOCAL_LOGIN_HOST_URL = f"http://{LOCAL_DEPLOYMENT_HOST}:8000"
+LOCAL_LOGIN_API_URL = f"http://{LOCAL_DEPLOYMENT_HOST}:8080/api/auth/login"
+
+# 备份并写入文件的 shell 脚本：$1 为目标文件，新内容从标准输入读取
+BACKUP_FAILED_EXIT_CODE = 3
+BACKUP_AND_WRITE_SCRIPT = f'cp "$1" "$1.backup" || exit {BACKUP_FAILED_EXIT_CODE}; cat > "$1"'
+
+# 读取子进程输出时每次读取的最大字节数
+OUTPUT_READ_CHUNK_SIZE = 64 * 1024
+
+# 输出密集时两次界面进度回调之间的最小间隔（秒）
+PROGRESS_UPDATE_INTERVAL = 0.1
+
+# 部署期间刷新 sudo 凭据时间戳的间隔（秒），需小于 sudo 默认的 5 分钟超时
+SUDO_REFRESH_INTERVAL = 240.0
+
+
+# os-release 中视为 openEuler 的系统 ID（hce 为 Huawei Cloud EulerOS）
+OPENEULER_OS_IDS = frozenset({"openeuler", "hce"})
+
+
+def _parse_os_release(content: str) -> dict[str, str]:
+    """解析 os-release 文件内容为键值字典"""
+    info: dict[str, str] = {}
+    for line in content.splitlines():
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if sep and key and not key.startswith("#"):
+            info[key] = value.strip().strip("\"'")
+    return info
+
+
+@cache
+def _detect_openeuler() -> bool:
+    """检测是否为 openEuler 系统，结果在进程内缓存"""
+    try:
+        # 检查 /etc/os-release 中的 ID 与 ID_LIKE，精确匹配系统标识
+        os_release_path = Path("/etc/os-release")
+        has_os_release = os_release_path.exists()
+        if has_os_release:
+            os_release = _parse_os_release(os_release_path.read_text(encoding="utf-8", errors="ignore"))
+            os_ids = {os_release.get("ID", "").lower(), *os_release.get("ID_LIKE", "").lower().split()}
+            if not os_ids.isdisjoint(OPENEULER_OS_IDS):
+                return True
+
+        # 检查 /etc/openEuler-release
+        openeuler_release_path = Path("/etc/openEuler-release")
+        hce_release_path = Path("/etc/hce-release")
+        if openeuler_release_path.exists() or hce_release_path.exists():
+            return True
+
+    except OSError as e:
+        logger.warning("检测操作系统时发生错误: %s", e)
+        return False
+
+    # 存在 os-release 时其结论已足够可靠，无需再检查 platform 信息
+    if has_os_release:
+        return False
+    system_info = platform.platform().lower()
+    return "openeuler" in system_info
+
+
+@lru_cache(maxsize=4)
+def _parse_toml_template(content: str) -> dict:
+    """解析 TOML 模板内容，相同内容只解析一次（调用方需深拷贝后再修改）"""
+    return tomllib.loads(content)
+
+
+def _format_toml_value(value: object) -> str:
+    """将单个值序列化为 TOML 字面量"""
+    return tomli_w.dumps({"value": value}).partition("=")[2].strip()
+
+
+def _split_toml_value(text: str) -> tuple[str, str] | None:
+    """
+    将单行 TOML 值与其后的内容（空白与行内注释）分开
+
+    Args:
+        text: 等号后去掉前导空白与换行符的内容
+
+    Returns:
+        tuple[str, str] | None: (值, 值之后的内容)；字符串未闭合时返回 None
+
+    """
+    if text.startswith('"'):
+        index = 1
+        while index < len(text):
+            if text[index] == "\\":
+                index += 2
+                continue
+            if text[index] == '"':
+                return text[: index + 1], text[index + 1 :]
+            index += 1
+        return None
+    if text.startswith("'"):
+        end = text.find("'", 1)
+        return (text[: end + 1], text[end + 1 :]) if end != -1 else None
+
+    # 数字、布尔值、日期等裸值：到行内注释或行尾为止
+    value = text.partition("#")[0].rstrip()
+    return value, text[len(value) :]
+
+
+def _edit_toml_lines(content: str, updates: dict[tuple[str, ...], dict[str, object]]) -> str | None:
+    """
+    逐行改写 TOML 内容中的指定键值，未修改的行（包括注释与空白）原样保留
+
+    Args:
+        content: TOML 原始内容
+        updates: 表路径到 {键: 新值} 的映射
+
+    Returns:
+        str | None: 改写后的内容；遇到无法安全逐行改写的情况（键缺失、多行值等）时返回 None
+
+    """
+    pending = {table: dict(values) for table, values in updates.items()}
+    lines: list[str] = []
+    table_values: dict[str, object] = {}
+    in_multiline = False
+
+    for line in content.splitlines(keepends=True):
+        stripped = line.strip()
+        if not in_multiline and stripped.startswith("["):
+            # 表头：引号键、数组表等复杂情况不做逐行改写
+            header = stripped[1 : stripped.find("]")]
+            simple = not stripped.startswith("[[") and "'" not in header and '"' not in header
+            table = tuple(part.strip() for part in header.split(".")) if simple else ()
+            table_values = pending.get(table, {})
+            lines.append(line)
+            continue
+
+        key_part, sep, rest = line.partition("=")
+        key = key_part.strip()
+        if in_multiline or not sep or key not in table_values:
+            if line.count('"""') % 2 or line.count("'''") % 2:
+                in_multiline = not in_multiline
+            lines.append(line)
+            continue
+
+        body = rest.rstrip("\r\n")
+        old_value = body.lstrip()
+        if old_value.startswith(('"""', "'''", "[", "{")):
+            return None
+        split = _split_toml_value(old_value)
+        if split is None:
+            return None
+        # 保留值之后的空白与行内注释
+        suffix = split[1]
+        spacing = body[: len(body) - len(old_value)]
+        value = _format_toml_value(table_values.pop(key))
+        lines.append(f"{key_part}{sep}{spacing}{value}{suffix}{rest[len(body) :]}")
+
+    if any(pending.values()):
+        return None
+    return "".join(lines)
+
 
 class DeploymentResourceManager:
     """部署资源管理器，管理 RPM 包安装的资源文件"""
@@ -41,6 +202,11 @@ class DeploymentResourceManager:
     RESOURCE_PATH = INSTALLER_BASE_PATH / "5-resource"
     DEPLOY_SCRIPT = INSTALLER_BASE_PATH / "deploy"
 
+    # 部署步骤脚本路径
+    CHECK_ENV_SCRIPT = INSTALLER_BASE_PATH / "1-check-env" / "check_env.sh"
+    INSTALL_DEPENDENCY_SCRIPT = INSTALLER_BASE_PATH / "2-install-dependency" / "install_openEulerIntelligence.sh"
+    INIT_CONFIG_SCRIPT = INSTALLER_BASE_PATH / "3-install-server" / "init_config.sh"
+
     # 配置文件模板路径
     ENV_TEMPLATE = RESOURCE_PATH / "env"
     CONFIG_TEMPLATE = RESOURCE_PATH / "config.toml"
@@ -48,16 +214,42 @@ class DeploymentResourceManager:
     # 系统配置文件路径
     INSTALL_MODE_FILE = Path("/etc/euler_Intelligence_install_mode")
 
+    # 作为子进程参数使用的路径字符串，只转换一次
+    ENV_TEMPLATE_STR: ClassVar[str] = str(ENV_TEMPLATE)
+    CONFIG_TEMPLATE_STR: ClassVar[str] = str(CONFIG_TEMPLATE)
+    INSTALL_MODE_FILE_STR: ClassVar[str] = str(INSTALL_MODE_FILE)
+
+    # env 配置项（KEY = VALUE 形式）与对应配置字段的取值函数
+    _ENV_FIELDS: ClassVar[dict[str, Callable[[DeploymentConfig], object]]] = {
+        # LLM 配置
+        "MODEL_NAME": attrgetter("llm.model"),
+        "OPENAI_API_BASE": attrgetter("llm.endpoint"),
+        "OPENAI_API_KEY": attrgetter("llm.api_key"),
+        "MAX_TOKENS": attrgetter("llm.max_tokens"),
+        "TEMPERATURE": attrgetter("llm.temperature"),
+        "REQUEST_TIMEOUT": attrgetter("llm.request_timeout"),
+        # Embedding 配置
+        "EMBEDDING_TYPE": attrgetter("embedding.type"),
+        "EMBEDDING_API_KEY": attrgetter("embedding.api_key"),
+        "EMBEDDING_ENDPOINT": attrgetter("embedding.endpoint"),
+        "EMBEDDING_MODEL_NAME": attrgetter("embedding.model"),
+    }
+
     @classmethod
     def check_installer_available(cls) -> bool:
         """检查安装器是否可用"""
-        return (
-            cls.INSTALLER_BASE_PATH.exists()
-            and cls.RESOURCE_PATH.exists()
-            and cls.DEPLOY_SCRIPT.exists()
-            and cls.ENV_TEMPLATE.exists()
-            and cls.CONFIG_TEMPLATE.exists()
-        )
+        # 每个目录只列举一次，再在内存中检查所需条目，避免逐个路径 stat
+        try:
+            with os.scandir(cls.INSTALLER_BASE_PATH) as entries:
+                base_entries = {entry.name for entry in entries}
+            with os.scandir(cls.RESOURCE_PATH) as entries:
+                resource_entries = {entry.name for entry in entries}
+        except OSError:
+            return False
+
+        required_base = {cls.RESOURCE_PATH.name, cls.DEPLOY_SCRIPT.name}
+        required_resource = {cls.ENV_TEMPLATE.name, cls.CONFIG_TEMPLATE.name}
+        return required_base <= base_entries and required_resource <= resource_entries
 
     @classmethod
     def get_template_content(cls, template_path: Path) -> str:
@@ -69,74 +261,65 @@ class DeploymentResourceManager:
             msg = _("无法读取模板文件: {path}").format(path=template_path)
             raise RuntimeError(msg) from e
 
+    @classmethod
+    async def render_template(
+        cls,
+        template_path: Path,
+        render: Callable[[str, DeploymentConfig], str],
+        config: DeploymentConfig,
+    ) -> str:
+        """在线程池中读取模板并生成配置内容，避免文件 I/O 与文本处理阻塞事件循环"""
+
+        def _read_and_render() -> str:
+            return render(cls.get_template_content(template_path), config)
+
+        return await asyncio.to_thread(_read_and_render)
+
     @classmethod
     def update_config_values(cls, content: str, config: DeploymentConfig) -> str:
         """根据用户配置更新配置文件内容"""
+        replacements = {key: str(getter(config)) for key, getter in cls._ENV_FIELDS.items()}
+
+        # 逐行扫描一次，按键名查表替换值，保留 "KEY = " 前缀格式与行尾
+        lines: list[str] = []
+        for line in content.splitlines(keepends=True):
+            key_part, sep, rest = line.partition("=")
+            value = replacements.get(key_part.strip()) if sep else None
+            if value is None:
+                lines.append(line)
+                continue
 
-        def safe_replace(pattern: str, replacement: str, text: str) -> str:
-            """安全的正则表达式替换，避免反向引用问题"""
-            # 使用 lambda 函数来避免反向引用问题
-            return re.sub(pattern, lambda m: m.group(1) + replacement, text)
-
-        # 更新 LLM 配置
-        content = safe_replace(r"(MODEL_NAME\s*=\s*).*", config.llm.model, content)
-        content = safe_replace(r"(OPENAI_API_BASE\s*=\s*).*", config.llm.endpoint, content)
-        content = safe_replace(r"(OPENAI_API_KEY\s*=\s*).*", config.llm.api_key, content)
-        content = safe_replace(r"(MAX_TOKENS\s*=\s*).*", str(config.llm.max_tokens), content)
-        content = safe_replace(r"(TEMPERATURE\s*=\s*).*", str(config.llm.temperature), content)
-        content = safe_replace(r"(REQUEST_TIMEOUT\s*=\s*).*", str(config.llm.request_timeout), content)
+            body = rest.rstrip("\r\n")
+            spacing = body[: len(body) - len(body.lstrip())]
+            lines.append(f"{key_part}{sep}{spacing}{value}{rest[len(body) :]}")
 
-        # 更新 Embedding 配置
-        content = safe_replace(r"(EMBEDDING_TYPE\s*=\s*).*", config.embedding.type, content)
-        content = safe_replace(r"(EMBEDDING_API_KEY\s*=\s*).*", config.embedding.api_key, content)
-        content = safe_replace(r"(EMBEDDING_ENDPOINT\s*=\s*).*", config.embedding.endpoint, content)
-        return safe_replace(r"(EMBEDDING_MODEL_NAME\s*=\s*).*", config.embedding.model, content)
+        return "".join(lines)
 
     @classmethod
     def update_toml_values(cls, content: str, config: DeploymentConfig) -> str:
         """更新 TOML 配置文件的值"""
         try:
-            # 解析 TOML 内容
-            toml_data = toml.loads(content)
-
-            # 更新服务器 IP
-            server_host = LOCAL_DEPLOYMENT_HOST
-            if "login" in toml_data and "settings" in toml_data["login"]:
-                toml_data["login"]["settings"]["host"] = f"http://{server_host}:8000"
-                toml_data["login"]["settings"]["login_api"] = f"http://{server_host}:8080/api/auth/login"
-
-            # 更新 fastapi 域名
-            if "fastapi" in toml_data:
-                toml_data["fastapi"]["domain"] = server_host
-
-            # 更新 LLM 配置
-            if "llm" in toml_data:
-                toml_data["llm"]["endpoint"] = config.llm.endpoint
-                toml_data["llm"]["key"] = config.llm.api_key
-                toml_data["llm"]["model"] = config.llm.model
-                toml_data["llm"]["max_tokens"] = config.llm.max_tokens
-                toml_data["llm"]["temperature"] = config.llm.temperature
-
-            # 更新 function_call 配置
-            if "function_call" in toml_data:
-                toml_data["function_call"]["backend"] = config.detected_backend_type
-                toml_data["function_call"]["endpoint"] = config.llm.endpoint
-                toml_data["function_call"]["api_key"] = config.llm.api_key
-                toml_data["function_call"]["model"] = config.llm.model
-                toml_data["function_call"]["max_tokens"] = config.llm.max_tokens
-                toml_data["function_call"]["temperature"] = config.llm.temperature
-
-            # 更新 Embedding 配置
-            if "embedding" in toml_data:
-                toml_data["embedding"]["type"] = config.embedding.type
-                toml_data["embedding"]["endpoint"] = config.embedding.endpoint
-                toml_data["embedding"]["api_key"] = config.embedding.api_key
-                toml_data["embedding"]["model"] = config.embedding.model
-
-            # 将更新后的数据转换回 TOML 格式
-            return toml.dumps(toml_data)
-
-        except toml.TomlDecodeError as e:
+            template = _parse_toml_template(content)
+            updates = cls._build_toml_updates(template, config)
+            if not updates:
+                # 模板中没有需要更新的表，直接沿用原内容
+                return content
+
+            # 优先逐行改写，保留模板中未修改部分的原始格式与注释
+            edited = _edit_toml_lines(content, updates)
+            if edited is not None:
+                return edited
+
+            # 无法逐行改写时，回退为修改解析结果（深拷贝缓存）后重新序列化
+            toml_data = copy.deepcopy(template)
+            for table_path, values in updates.items():
+                table = toml_data
+                for part in table_path:
+                    table = table[part]
+                table.update(values)
+            return tomli_w.dumps(toml_data)
+
+        except tomllib.TOMLDecodeError as e:
             logger.exception("解析 TOML 内容时出错")
             msg = _("TOML 格式错误: {error}").format(error=e)
             raise ValueError(msg) from e
@@ -145,6 +328,60 @@ class DeploymentResourceManager:
             msg = _("更新 TOML 配置失败: {error}").format(error=e)
             raise RuntimeError(msg) from e
 
+    @classmethod
+    def _build_toml_updates(
+        cls,
+        toml_data: dict,
+        config: DeploymentConfig,
+    ) -> dict[tuple[str, ...], dict[str, object]]:
+        """根据用户配置生成需要更新的 TOML 表与键值（只包含模板中存在的表）"""
+        updates: dict[tuple[str, ...], dict[str, object]] = {}
+        llm = config.llm
+        embedding = config.embedding
+
+        # 更新服务器 IP
+        if "login" in toml_data and "settings" in toml_data["login"]:
+            updates[("login", "settings")] = {
+                "host": LOCAL_LOGIN_HOST_URL,
+                "login_api": LOCAL_LOGIN_API_URL,
+            }
+
+        # 更新 fastapi 域名
+        if "fastapi" in toml_data:
+            updates[("fastapi",)] = {"domain": LOCAL_DEPLOYMENT_HOST}
+
+        # 更新 LLM 配置
+        if "llm" in toml_data:
+            updates[("llm",)] = {
+                "endpoint": llm.endpoint,
+                "key": llm.api_key,
+                "model": llm.model,
+                "max_tokens": llm.max_tokens,
+                "temperature": llm.temperature,
+            }
+
+        # 更新 function_call 配置
+        if "function_call" in toml_data:
+            updates[("function_call",)] = {
+                "backend": config.detected_backend_type,
+                "endpoint": llm.endpoint,
+                "api_key": llm.api_key,
+                "model": llm.model,
+                "max_tokens": llm.max_tokens,
+                "temperature": llm.temperature,
+            }
+
+        # 更新 Embedding 配置
+        if "embedding" in toml_data:
+            updates[("embedding",)] = {
+                "type": embedding.type,
+                "endpoint": embedding.endpoint,
+                "api_key": embedding.api_key,
+                "model": embedding.model,
+            }
+
+        return updates
+
     @classmethod
     def create_deploy_mode_content(cls, config: DeploymentConfig) -> str:
         """创建部署模式配置内容"""
@@ -156,6 +393,49 @@ rag_install={rag_install}
 """
 
 
+class _ProgressThrottle:
+    """
+    进度回调限流器
+
+    两次回调间隔不足 PROGRESS_UPDATE_INTERVAL 时合并更新，并在间隔结束时补发最新状态；
+    部署步骤切换时立即回调。
+    """
+
+    def __init__(self, callback: Callable[[DeploymentState], None]) -> None:
+        """初始化限流器"""
+        self._callback = callback
+        self._last_emit = float("-inf")
+        self._last_step: int | None = None
+        self._pending: asyncio.TimerHandle | None = None
+        self._pending_state: DeploymentState | None = None
+
+    def __call__(self, state: DeploymentState) -> None:
+        """接收一次进度更新"""
+        loop = asyncio.get_running_loop()
+        elapsed = loop.time() - self._last_emit
+        if state.current_step != self._last_step or elapsed >= PROGRESS_UPDATE_INTERVAL:
+            self._emit(state)
+            return
+
+        self._pending_state = state
+        if self._pending is None:
+            self._pending = loop.call_later(PROGRESS_UPDATE_INTERVAL - elapsed, self.flush)
+
+    def flush(self) -> None:
+        """立即补发尚未发出的更新"""
+        if self._pending_state is not None:
+            self._emit(self._pending_state)
+
+    def _emit(self, state: DeploymentState) -> None:
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        self._pending_state = None
+        self._last_emit = asyncio.get_running_loop().time()
+        self._last_step = state.current_step
+        self._callback(state)
+
+
 class DeploymentService:
     """
     部署服务
@@ -168,7 +448,8 @@ class DeploymentService:
         """初始化部署服务"""
         self.state = DeploymentState()
         self._process: asyncio.subprocess.Process | None = None
-        self.resource_manager = DeploymentResourceManager()
+        self._sudo_ok = False
+        self._sudo_refresh_task: asyncio.Task[None] | None = None
 
     # 公共方法
 
@@ -208,7 +489,7 @@ class DeploymentService:
             progress_callback(temp_state)
 
         # 检查并安装 openeuler-intelligence-installer
-        if not self.resource_manager.check_installer_available():
+        if not DeploymentResourceManager.check_installer_available():
             if progress_callback:
                 temp_state.add_log(_("缺少 openeuler-intelligence-installer 包，正在尝试安装..."))
                 progress_callback(temp_state)
@@ -231,27 +512,7 @@ class DeploymentService:
 
     def detect_openeuler(self) -> bool:
         """检测是否为 openEuler 系统"""
-        try:
-            # 检查 /etc/os-release
-            os_release_path = Path("/etc/os-release")
-            if os_release_path.exists():
-                content = os_release_path.read_text(encoding="utf-8").lower()
-                if "openeuler" in content or "huawei cloud euleros" in content:
-                    return True
-
-            # 检查 /etc/openEuler-release
-            openeuler_release_path = Path("/etc/openEuler-release")
-            hce_release_path = Path("/etc/hce-release")
-            if openeuler_release_path.exists() or hce_release_path.exists():
-                return True
-
-        except OSError as e:
-            logger.warning("检测操作系统时发生错误: %s", e)
-            return False
-        else:
-            # 检查 platform 信息
-            system_info = platform.platform().lower()
-            return "openeuler" in system_info
+        return _detect_openeuler()
 
     def check_python_version_for_deployment(self, deployment_mode: str) -> tuple[bool, str]:
         """
@@ -283,20 +544,24 @@ class DeploymentService:
             return True, _("Python 环境版本 {version} 符合要求").format(version=current_version)
 
     async def check_sudo_privileges(self) -> bool:
-        """检查 sudo 权限"""
+        """检查 sudo 权限（检查通过后在本会话内缓存结果，失败时下次重新检查）"""
+        if self._sudo_ok:
+            return True
+
         try:
             process = await asyncio.create_subprocess_exec(
                 "sudo",
                 "-n",
                 "true",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
             )
             return_code = await process.wait()
         except OSError:
             return False
-        else:
-            return return_code == 0
+
+        self._sudo_ok = return_code == 0
+        return self._sudo_ok
 
     async def deploy(
         self,
@@ -326,8 +591,15 @@ class DeploymentService:
             # 根据部署模式设置总步数：轻量模式5步，全量模式4步
             self.state.total_steps = 5 if config.deployment_mode == "light" else 4
 
-            # 执行部署步骤
-            success = await self._execute_deployment_steps(config, progress_callback)
+            # 执行部署步骤，期间定期刷新 sudo 凭据，避免长时间的安装脚本执行后凭据过期；
+            # 步骤中的进度回调经过限流合并，步骤结束后补发最后一次更新
+            throttled_callback = _ProgressThrottle(progress_callback) if progress_callback else None
+            try:
+                async with self._sudo_keepalive():
+                    success = await self._execute_deployment_steps(config, throttled_callback)
+            finally:
+                if throttled_callback:
+                    throttled_callback.flush()
 
             if not success:
                 return False
@@ -360,6 +632,9 @@ class DeploymentService:
 
     def cancel_deployment(self) -> None:
         """取消部署"""
+        if self._sudo_refresh_task:
+            self._sudo_refresh_task.cancel()
+
         if self._process:
             try:
                 self._process.terminate()
@@ -369,6 +644,35 @@ class DeploymentService:
 
     # 私有方法
 
+    @contextlib.asynccontextmanager
+    async def _sudo_keepalive(self) -> AsyncIterator[None]:
+        """在上下文期间后台定期刷新 sudo 凭据时间戳"""
+        self._sudo_refresh_task = asyncio.create_task(self._refresh_sudo_timestamp())
+        try:
+            yield
+        finally:
+            self._sudo_refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sudo_refresh_task
+            self._sudo_refresh_task = None
+
+    async def _refresh_sudo_timestamp(self) -> None:
+        """每隔 SUDO_REFRESH_INTERVAL 秒以非交互方式刷新一次 sudo 凭据"""
+        while True:
+            await asyncio.sleep(SUDO_REFRESH_INTERVAL)
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "sudo",
+                    "-n",
+                    "-v",
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                await process.wait()
+            except OSError as e:
+                logger.warning("刷新 sudo 凭据失败: %s", e)
+                return
+
     async def _install_intelligence_installer(
         self,
         progress_callback: Callable[[DeploymentState], None] | None = None,
@@ -394,7 +698,7 @@ class DeploymentService:
 
             if success:
                 # 验证安装是否成功
-                if self.resource_manager.check_installer_available():
+                if DeploymentResourceManager.check_installer_available():
                     if progress_callback:
                         temp_state.add_log(_("✓ openeuler-intelligence-installer 安装成功"))
                         progress_callback(temp_state)
@@ -454,14 +758,19 @@ class DeploymentService:
             stderr=asyncio.subprocess.STDOUT,
         )
 
-        # 读取安装输出
+        # 读取安装输出，界面更新经限流合并，读取结束后补发最后一次更新
         output_lines = []
         if process.stdout:
-            async for line in self._read_process_output_lines(process):
-                output_lines.append(line)
-                if progress_callback:
-                    temp_state.add_log(f"安装: {line}")
-                    progress_callback(temp_state)
+            throttled_callback = _ProgressThrottle(progress_callback) if progress_callback else None
+            try:
+                async for line in self._read_process_output_lines(process):
+                    output_lines.append(line)
+                    if throttled_callback:
+                        temp_state.add_log(f"安装: {line}")
+                        throttled_callback(temp_state)
+            finally:
+                if throttled_callback:
+                    throttled_callback.flush()
 
         # 等待进程结束
         return_code = await process.wait()
@@ -493,7 +802,7 @@ class DeploymentService:
             return False
 
         # 检查安装器资源
-        if not self.resource_manager.check_installer_available():
+        if not DeploymentResourceManager.check_installer_available():
             self.state.add_log(_("✗ 错误: openeuler-intelligence-installer 包未安装或资源缺失"))
             self.state.add_log(_("请先安装: sudo dnf install -y openeuler-intelligence-installer"))
             return False
@@ -522,19 +831,19 @@ class DeploymentService:
 
         try:
             # 生成部署模式文件内容
-            mode_content = self.resource_manager.create_deploy_mode_content(config)
+            mode_content = DeploymentResourceManager.create_deploy_mode_content(config)
 
-            # 写入系统配置文件
+            # 写入系统配置文件（tee 回显的内容无需读取）
             cmd = [
                 "sudo",
                 "tee",
-                str(self.resource_manager.INSTALL_MODE_FILE),
+                DeploymentResourceManager.INSTALL_MODE_FILE_STR,
             ]
 
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
 
@@ -571,8 +880,11 @@ class DeploymentService:
             progress_callback(self.state)
 
         try:
-            script_path = self.resource_manager.INSTALLER_BASE_PATH / "1-check-env" / "check_env.sh"
-            return await self._run_script(script_path, _("环境检查脚本"), progress_callback)
+            return await self._run_script(
+                DeploymentResourceManager.CHECK_ENV_SCRIPT,
+                _("环境检查脚本"),
+                progress_callback,
+            )
         except Exception as e:
             self.state.add_log(_("✗ 环境检查失败: {error}").format(error=e))
             logger.exception("环境检查脚本执行失败")
@@ -592,10 +904,11 @@ class DeploymentService:
             progress_callback(self.state)
 
         try:
-            script_path = (
-                self.resource_manager.INSTALLER_BASE_PATH / "2-install-dependency" / "install_openEulerIntelligence.sh"
+            return await self._run_script(
+                DeploymentResourceManager.INSTALL_DEPENDENCY_SCRIPT,
+                _("依赖安装脚本"),
+                progress_callback,
             )
-            return await self._run_script(script_path, _("依赖安装脚本"), progress_callback)
         except Exception as e:
             self.state.add_log(_("✗ 依赖安装失败: {error}").format(error=e))
             logger.exception("依赖安装脚本执行失败")
@@ -615,8 +928,11 @@ class DeploymentService:
             progress_callback(self.state)
 
         try:
-            script_path = self.resource_manager.INSTALLER_BASE_PATH / "3-install-server" / "init_config.sh"
-            return await self._run_script(script_path, _("配置初始化脚本"), progress_callback)
+            return await self._run_script(
+                DeploymentResourceManager.INIT_CONFIG_SCRIPT,
+                _("配置初始化脚本"),
+                progress_callback,
+            )
         except Exception as e:
             self.state.add_log(_("✗ 配置初始化失败: {error}").format(error=e))
             logger.exception("配置初始化脚本执行失败")
@@ -647,23 +963,14 @@ class DeploymentService:
                 cwd=script_dir,
             )
 
-            # 创建心跳任务，定期更新界面
-            heartbeat_task = asyncio.create_task(self._heartbeat_progress(progress_callback))
-
-            try:
-                # 读取输出
-                async for line in self._read_process_output_lines(self._process):
-                    self.state.add_log(line)
-                    if progress_callback:
-                        progress_callback(self.state)
+            # 读取输出；部署步骤收到的 progress_callback 已经过限流，输出密集时不会频繁重绘
+            async for line in self._read_process_output_lines(self._process):
+                self.state.add_log(line)
+                if progress_callback:
+                    progress_callback(self.state)
 
-                # 等待进程结束
-                return_code = await self._process.wait()
-            finally:
-                # 取消心跳任务
-                heartbeat_task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await heartbeat_task
+            # 等待进程结束
+            return_code = await self._process.wait()
 
             self._process = None
 
@@ -680,17 +987,6 @@ class DeploymentService:
             self.state.add_log(_("✗ {name}执行失败，返回码: {code}").format(name=script_name, code=return_code))
             return False
 
-    async def _heartbeat_progress(self, progress_callback: Callable[[DeploymentState], None] | None) -> None:
-        """心跳进度更新，确保界面不会卡死"""
-        if not progress_callback:
-            return
-
-        with contextlib.suppress(asyncio.CancelledError):
-            while True:
-                await asyncio.sleep(1.0)  # 每秒更新一次
-                if progress_callback:
-                    progress_callback(self.state)
-
     async def _generate_config_files(
         self,
         config: DeploymentConfig,
@@ -704,133 +1000,114 @@ class DeploymentService:
         if progress_callback:
             progress_callback(self.state)
 
-        try:
-            # 更新 env 文件
-            await self._update_env_file(config)
-            self.state.add_log(_("✓ 更新 env 配置文件"))
-
-            # 更新 config.toml 文件
-            await self._update_config_toml(config)
-            self.state.add_log(_("✓ 更新 config.toml 配置文件"))
-
-        except Exception as e:
-            self.state.add_log(_("✗ 更新配置文件失败: {error}").format(error=e))
-            logger.exception("更新配置文件失败")
-            return False
+        # env 与 config.toml 互不依赖，并发更新；两者都结束后再统一处理错误。
+        # 其中一个写入失败时另一个可能已经写入，两者各自保留了 .backup 备份
+        results = await asyncio.gather(
+            self._update_env_file(config),
+            self._update_config_toml(config),
+            return_exceptions=True,
+        )
+        for error in results:
+            if isinstance(error, BaseException):
+                self.state.add_log(_("✗ 更新配置文件失败: {error}").format(error=error))
+                logger.error("更新配置文件失败", exc_info=error)
+                return False
 
+        self.state.add_log(_("✓ 更新 env 配置文件"))
+        self.state.add_log(_("✓ 更新 config.toml 配置文件"))
         return True
 
     async def _update_env_file(self, config: DeploymentConfig) -> None:
         """更新 env 配置文件"""
-        template_content = self.resource_manager.get_template_content(
-            self.resource_manager.ENV_TEMPLATE,
-        )
-
-        updated_content = self.resource_manager.update_config_values(
-            template_content,
+        updated_content = await DeploymentResourceManager.render_template(
+            DeploymentResourceManager.ENV_TEMPLATE,
+            DeploymentResourceManager.update_config_values,
             config,
         )
 
-        # 备份原文件并写入新内容
-        backup_cmd = [
-            "sudo",
-            "cp",
-            str(self.resource_manager.ENV_TEMPLATE),
-            f"{self.resource_manager.ENV_TEMPLATE}.backup",
-        ]
-        backup_process = await asyncio.create_subprocess_exec(
-            *backup_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        await self._backup_and_write(
+            DeploymentResourceManager.ENV_TEMPLATE_STR,
+            updated_content,
+            backup_error=_("备份 env 文件失败: {error}"),
+            write_error=_("写入 env 文件失败: {error}"),
         )
-        _backup_stdout, backup_stderr = await backup_process.communicate()
-
-        if backup_process.returncode != 0:
-            error_msg = backup_stderr.decode("utf-8", errors="ignore").strip()
-            msg = _("备份 env 文件失败: {error}").format(error=error_msg)
-            raise RuntimeError(msg)
-
-        # 写入更新后的内容
-        write_cmd = ["sudo", "tee", str(self.resource_manager.ENV_TEMPLATE)]
-        process = await asyncio.create_subprocess_exec(
-            *write_cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _write_stdout, write_stderr = await process.communicate(updated_content.encode())
-
-        if process.returncode != 0:
-            error_msg = write_stderr.decode("utf-8", errors="ignore").strip()
-            msg = _("写入 env 文件失败: {error}").format(error=error_msg)
-            raise RuntimeError(msg)
 
     async def _update_config_toml(self, config: DeploymentConfig) -> None:
         """更新 config.toml 配置文件"""
-        template_content = self.resource_manager.get_template_content(
-            self.resource_manager.CONFIG_TEMPLATE,
-        )
-
-        updated_content = self.resource_manager.update_toml_values(
-            template_content,
+        updated_content = await DeploymentResourceManager.render_template(
+            DeploymentResourceManager.CONFIG_TEMPLATE,
+            DeploymentResourceManager.update_toml_values,
             config,
         )
 
-        # 备份原文件并写入新内容
-        backup_cmd = [
-            "sudo",
-            "cp",
-            str(self.resource_manager.CONFIG_TEMPLATE),
-            f"{self.resource_manager.CONFIG_TEMPLATE}.backup",
-        ]
-        backup_process = await asyncio.create_subprocess_exec(
-            *backup_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        await self._backup_and_write(
+            DeploymentResourceManager.CONFIG_TEMPLATE_STR,
+            updated_content,
+            backup_error=_("备份 config.toml 文件失败: {error}"),
+            write_error=_("写入 config.toml 文件失败: {error}"),
         )
-        _backup_stdout, backup_stderr = await backup_process.communicate()
 
-        if backup_process.returncode != 0:
-            error_msg = backup_stderr.decode("utf-8", errors="ignore").strip()
-            msg = _("备份 config.toml 文件失败: {error}").format(error=error_msg)
-            raise RuntimeError(msg)
+    async def _backup_and_write(
+        self,
+        path: str,
+        content: str,
+        *,
+        backup_error: str,
+        write_error: str,
+    ) -> None:
+        """
+        备份文件并写入新内容
+
+        备份与写入合并为一次 sudo 调用，新内容通过标准输入传入。
 
-        # 写入更新后的内容
-        write_cmd = ["sudo", "tee", str(self.resource_manager.CONFIG_TEMPLATE)]
+        Args:
+            path: 目标文件路径
+            content: 要写入的内容
+            backup_error: 备份失败时的错误消息模板（包含 {error} 占位符）
+            write_error: 写入失败时的错误消息模板（包含 {error} 占位符）
+
+        """
         process = await asyncio.create_subprocess_exec(
-            *write_cmd,
+            "sudo",
+            "sh",
+            "-c",
+            BACKUP_AND_WRITE_SCRIPT,
+            "sh",
+            path,
             stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
         )
-        _write_stdout, write_stderr = await process.communicate(updated_content.encode())
+        _stdout, stderr = await process.communicate(content.encode())
 
         if process.returncode != 0:
-            error_msg = write_stderr.decode("utf-8", errors="ignore").strip()
-            msg = _("写入 config.toml 文件失败: {error}").format(error=error_msg)
-            raise RuntimeError(msg)
+            error_msg = stderr.decode("utf-8", errors="ignore").strip()
+            template = backup_error if process.returncode == BACKUP_FAILED_EXIT_CODE else write_error
+            raise RuntimeError(template.format(error=error_msg))
 
     async def _read_process_output_lines(self, process: asyncio.subprocess.Process) -> AsyncGenerator[str, None]:
         """读取进程输出行"""
         if not process.stdout:
             return
 
-        while not process.stdout.at_eof():
-            try:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-
-                decoded_line = line.decode("utf-8", errors="ignore").strip()
-                if decoded_line:
-                    yield decoded_line
-
-                # 每次读取后让出控制权
-                await asyncio.sleep(0)
+        # 按块读取已到达的全部输出，每块只解码一次再拆分为行；
+        # 界面刷新由调用方经 _ProgressThrottle 限流后回调
+        pending = b""
+        try:
+            while chunk := await process.stdout.read(OUTPUT_READ_CHUNK_SIZE):
+                # 只处理到最后一个换行符为止的完整行，剩余部分留到下一块（避免截断多字节字符）
+                complete, newline, pending = (pending + chunk).rpartition(b"\n")
+                if not newline:
+                    continue
+                for line in complete.decode("utf-8", errors="ignore").split("\n"):
+                    if stripped := line.strip():
+                        yield stripped
+        except OSError as e:
+            logger.warning("读取进程输出时发生错误: %s", e)
 
-            except OSError as e:
-                logger.warning("读取进程输出时发生错误: %s", e)
-                break
+        # 输出结束时可能还有不以换行符结尾的最后一行
+        if stripped := pending.decode("utf-8", errors="ignore").strip():
+            yield stripped
 
     async def _check_framework_service_health(
         self,
@@ -872,7 +1149,7 @@ class DeploymentService:
                     "is-active",
                     "oi-runtime",
                     stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
                 )
 
                 stdout, _stderr = await process.communicate()
@@ -902,22 +1179,36 @@ class DeploymentService:
         server_port: int,
         progress_callback: Callable[[DeploymentState], None] | None,
     ) -> bool:
-        """检查 oi-runtime API 健康状态，每10秒检查一次，5分钟后超时"""
-        max_attempts = 30
-        check_interval = 10.0  # 10秒
-        api_url = f"http://{server_host}:{server_port}/api/user"
+        """检查 oi-runtime API 健康状态，按指数退避间隔重试（1秒起，最长8秒），5分钟后超时"""
+        deadline = 300.0  # 总等待时间上限（秒）
+        base_delay = 1.0
+        max_delay = 8.0
+        timeout_penalty = 2.0  # 请求超时说明服务繁忙，额外延长等待
+        request_timeout = 5.0  # 单次请求（含连接建立）的总时间上限
+        # 请求地址在轮询前解析一次，每次请求直接复用 httpx.URL 对象
+        api_url = httpx.URL(f"http://{server_host}:{server_port}/api/user")
         http_ok = 200  # HTTP OK 状态码
 
         self.state.add_log(_("等待 openEuler Intelligence 服务就绪"))
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(5.0)) as client:
-            for attempt in range(1, max_attempts + 1):
-                logger.debug("第 %d 次检查 openEuler Intelligence 服务状态...", attempt)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        failures = 0
+
+        # 只访问同一地址，保留一个空闲连接且存活时间覆盖最长等待间隔，使轮询之间可以复用连接
+        limits = httpx.Limits(max_keepalive_connections=1, keepalive_expiry=(max_delay + timeout_penalty) * 2)
+        async with httpx.AsyncClient(timeout=httpx.Timeout(request_timeout, connect=2.0), limits=limits) as client:
+            while True:
+                elapsed = loop.time() - start_time
+                logger.debug("已等待 %.1f 秒，检查 openEuler Intelligence 服务状态...", elapsed)
                 if progress_callback:
                     progress_callback(self.state)
 
+                delay = min(max_delay, base_delay * 2**failures)
                 try:
-                    response = await client.get(api_url)
+                    # httpx 的超时按阶段分别计算，外层再限制整个请求的总耗时，保证轮询节奏
+                    async with asyncio.timeout(request_timeout):
+                        response = await client.get(api_url)
 
                     if response.status_code == http_ok:
                         self.state.add_log(_("✓ openEuler Intelligence 服务已就绪"))
@@ -925,13 +1216,17 @@ class DeploymentService:
 
                 except httpx.ConnectError:
                     pass
-                except httpx.TimeoutException:
+                except (httpx.TimeoutException, TimeoutError):
                     self.state.add_log(_("连接 {url} 超时").format(url=api_url))
+                    delay += timeout_penalty
                 except (httpx.RequestError, OSError) as e:
                     self.state.add_log(_("API 连通性检查时发生错误: {error}").format(error=e))
 
-                if attempt < max_attempts:
-                    await asyncio.sleep(check_interval)
+                remaining = deadline - (loop.time() - start_time)
+                if remaining <= 0:
+                    break
+                failures += 1
+                await asyncio.sleep(min(delay, remaining))
 
         self.state.add_log(_("✗ openEuler Intelligence API 服务检查超时失败"))
         return False
@@ -992,34 +1287,44 @@ class DeploymentService:
 
         """
         try:
-            # 获取当前 root 用户的实际配置（包含 Agent 初始化后的完整配置）
-            current_config_manager = ConfigManager()
+            # 配置文件的读写在线程池中执行，避免阻塞事件循环
+            success = await asyncio.to_thread(self._write_global_config_template, config)
+        except Exception:
+            # 部署已成功，模板创建失败（文件读写失败、已有配置内容无法解析等）只记录警告，不影响部署结果
+            logger.exception("创建全局配置模板时发生异常")
+            self.state.add_log(_("⚠ 配置模板创建异常，可能影响其他用户使用"))
+            return
+
+        if success:
+            self.state.add_log(_("✓ 全局配置模板创建成功，其他用户可正常使用"))
+            logger.info("全局配置模板创建成功，包含部署时的完整配置信息")
+        else:
+            self.state.add_log(_("⚠ 全局配置模板创建失败，可能影响其他用户使用"))
+            logger.warning("全局配置模板创建失败")
+
+    def _write_global_config_template(self, config: DeploymentConfig) -> bool:
+        """
+        写入全局配置模板（同步执行）
 
-            # 将部署时用户输入的经过验证的大模型信息设置为默认的 OpenAI 配置
-            # 这样其他用户可以直接使用这些已验证的配置
-            current_config_manager.set_base_url(config.llm.endpoint)
-            current_config_manager.set_model(config.llm.model)
-            current_config_manager.set_api_key(config.llm.api_key)
+        必须在 Agent 初始化完成后调用，以便读取到 Agent 初始化写入的配置
 
-            # 创建专用的模板配置管理器
-            template_manager = ConfigManager.create_deployment_manager()
+        Args:
+            config: 部署配置
 
-            # 将当前 root 用户的完整配置复制到模板中
-            template_manager.data = current_config_manager.data
+        Returns:
+            bool: 模板是否创建成功
 
-            # 创建全局配置模板文件
-            success = template_manager.create_global_template()
+        """
+        # 获取当前 root 用户的实际配置（包含 Agent 初始化后的完整配置）
+        current_config_manager = ConfigManager()
 
-            if success:
-                self.state.add_log(_("✓ 全局配置模板创建成功，其他用户可正常使用"))
-                logger.info("全局配置模板创建成功，包含部署时的完整配置信息")
-            else:
-                self.state.add_log(_("⚠ 全局配置模板创建失败，可能影响其他用户使用"))
-                logger.warning("全局配置模板创建失败")
+        # 将部署时用户输入的经过验证的大模型信息设置为默认的 OpenAI 配置
+        # 这样其他用户可以直接使用这些已验证的配置
+        current_config_manager.set_openai_config(config.llm.endpoint, config.llm.model, config.llm.api_key)
 
-        except Exception:
-            logger.exception("创建全局配置模板时发生异常")
-            self.state.add_log(_("⚠ 配置模板创建异常，可能影响其他用户使用"))
+        # 直接将当前 root 用户的完整配置保存为全局配置模板（模板路径固定为 GLOBAL_CONFIG_PATH），
+        # 无需再创建读取旧模板的部署配置管理器并复制配置数据
+        return current_config_manager.create_global_template()
 
     def _update_backend_url_config(self, config: DeploymentConfig) -> None:
         """
@@ -1069,64 +1374,61 @@ class DeploymentService:
 
         services_to_check = ["oi-runtime", "oi-rag"]
 
-        for service_name in services_to_check:
-            try:
-                # 检查服务状态
-                process = await asyncio.create_subprocess_exec(
-                    "systemctl",
-                    "is-active",
-                    service_name,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
+        try:
+            # 一次 systemctl 调用查询全部服务状态，输出按参数顺序逐行对应
+            process = await asyncio.create_subprocess_exec(
+                "systemctl",
+                "is-active",
+                *services_to_check,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
 
-                stdout, _stderr = await process.communicate()
-                status = stdout.decode("utf-8").strip()
+            stdout, _stderr = await process.communicate()
+            # 状态直接按字节比较，只有需要写入日志的未知状态才解码
+            statuses = stdout.splitlines()
 
-                if process.returncode == 0 and status == "active":
+            active_services: list[str] = []
+            for service_name, raw_status in zip(services_to_check, statuses, strict=False):
+                status = raw_status.strip()
+                if status == b"active":
                     logger.info("发现正在运行的 %s 服务，正在停止...", service_name)
-
-                    if progress_callback:
-                        progress_callback(self.state)
-
-                    # 停止服务
-                    stop_process = await asyncio.create_subprocess_exec(
-                        "sudo",
-                        "systemctl",
-                        "stop",
-                        service_name,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
+                    active_services.append(service_name)
+                elif status in (b"inactive", b"failed"):
+                    logger.info("✓ 没有发现运行中的 %s 服务", service_name)
+                else:
+                    logger.warning(
+                        "%s 服务状态: %s",
+                        service_name.capitalize(),
+                        status.decode("utf-8", errors="ignore"),
                     )
 
-                    _, stop_stderr = await stop_process.communicate()
+            if active_services:
+                if progress_callback:
+                    progress_callback(self.state)
 
-                    if stop_process.returncode == 0:
-                        logger.info("旧的 %s 服务已停止", service_name)
-                    else:
-                        error_msg = stop_stderr.decode("utf-8", errors="ignore").strip()
-                        logger.warning("⚠ 停止 %s 服务时出现警告: %s", service_name, error_msg)
-                        # 继续部署，不因停止服务失败而中断
+                # 一次调用停止所有运行中的服务；systemctl stop 默认会等待停止任务完成后才返回，无需额外等待
+                stop_process = await asyncio.create_subprocess_exec(
+                    "sudo",
+                    "systemctl",
+                    "stop",
+                    *active_services,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                )
 
-                    # 等待服务完全停止
-                    await asyncio.sleep(1.0)
+                _stdout, stop_stderr = await stop_process.communicate()
 
-                elif status in ("inactive", "failed"):
-                    logger.info("✓ 没有发现运行中的 %s 服务", service_name)
+                if stop_process.returncode == 0:
+                    logger.info("旧的 %s 服务已停止", ", ".join(active_services))
                 else:
-                    logger.warning("%s 服务状态: %s", service_name.capitalize(), status)
-
-            except (OSError, TimeoutError) as e:
-                # 如果系统中没有该服务，systemctl 命令可能会失败
-                # 这种情况下我们记录信息但不阻止部署继续进行
-                logger.warning("检查 %s 服务状态时发生错误: %s", service_name, e)
-                continue
-
-            except Exception:
-                logger.exception("处理 %s 服务时发生异常", service_name)
-                return False
-
-        # 等待所有服务完全停止
-        await asyncio.sleep(1.0)
+                    error_msg = stop_stderr.decode("utf-8", errors="ignore").strip()
+                    logger.warning("⚠ 停止 %s 服务时出现警告: %s", ", ".join(active_services), error_msg)
+                    # 继续部署，不因停止服务失败而中断
+
+        except (OSError, TimeoutError) as e:
+            # 如果系统中没有该服务，systemctl 命令可能会失败
+            # 这种情况下我们记录信息但不阻止部署继续进行
+            logger.warning("检查服务状态时发生错误: %s", e)
 
         return True
@@ -691,7 +691,6 @@ class DeploymentProgressScreen(ModalScreen[bool]):
         self.deployment_cancelled = False
         self.deployment_errors: list[str] = []
         self.deployment_progress_value = 0
-        self.latest_log: str = ""
 
     def compose(self) -> ComposeResult:
         """组合界面组件"""
@@ -773,7 +772,6 @@ class DeploymentProgressScreen(ModalScreen[bool]):
         self.deployment_cancelled = False
         self.deployment_errors.clear()
         self.deployment_progress_value = 0  # 重置进度记录
-        self.latest_log = ""
 
         # 重置进度
         self.query_one("#step_label", Static).update("")
@@ -897,18 +895,16 @@ class DeploymentProgressScreen(ModalScreen[bool]):
         )
         self.query_one("#step_label", Static).update(step_text)
 
-        # 添加最新的日志条目
+        # 添加自上次更新以来的全部新日志条目（进度回调可能合并了多条日志）
         log_widget = self.query_one("#deployment_log", RichLog)
-        if state.output_log and self.latest_log != state.output_log[-1]:
-            # 只显示最新的日志条目
-            self.latest_log = state.output_log[-1]
+        for log_line in state.drain_new_logs():
             try:
-                if self.latest_log.startswith("✓"):
-                    log_widget.write(f"[green]{self.latest_log}[/green]")
-                elif self.latest_log.startswith("✗"):
-                    log_widget.write(f"[red]{self.latest_log}[/red]")
+                if log_line.startswith("✓"):
+                    log_widget.write(f"[green]{log_line}[/green]")
+                elif log_line.startswith("✗"):
+                    log_widget.write(f"[red]{log_line}[/red]")
                 else:
-                    log_widget.write(self.latest_log)
+                    log_widget.write(log_line)
             except MarkupError:
                 # 忽略日志消息格式错误
                 pass
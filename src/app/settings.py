@@ -337,9 +337,7 @@ class SettingsScreen(ModalScreen):
                 # 如果模型输入框不存在，保持当前选择的模型
                 pass
 
-            self.config_manager.set_base_url(base_url)
-            self.config_manager.set_api_key(api_key)
-            self.config_manager.set_model(self.selected_model)
+            self.config_manager.set_openai_config(base_url, self.selected_model, api_key)
         else:  # eulerintelli
             self.config_manager.set_eulerintelli_url(base_url)
             self.config_manager.set_eulerintelli_key(api_key)
@@ -159,6 +159,13 @@ class ConfigManager:
         """获取当前 api_key"""
         return self.data.openai.api_key
 
+    def set_openai_config(self, base_url: str, model: str, api_key: str) -> None:
+        """同时更新 OpenAI 的 base_url、模型与 api_key，只保存一次"""
+        self.data.openai.base_url = base_url
+        self.data.openai.model = model
+        self.data.openai.api_key = api_key
+        self._save_settings()
+
     def get_backend(self) -> Backend:
         """获取当前后端"""
         return self.data.backend
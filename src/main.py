@@ -17,7 +17,6 @@ from log.manager import (
     get_logger,
     setup_logging,
 )
-from tool import backend_init, browser_login, llm_config, select_agent
 
 
 def parse_args() -> argparse.Namespace:
@@ -208,15 +207,22 @@ def main() -> None:  # noqa: C901, PLR0911
         show_logs()
         return
 
+    # 各子命令的入口按需导入，避免每次启动都加载部署、配置等界面依赖
     if args.init:
+        from tool import backend_init  # noqa: PLC0415
+
         backend_init()
         return
 
     if args.agent:
+        from tool import select_agent  # noqa: PLC0415
+
         asyncio.run(select_agent())
         return
 
     if args.llm_config:
+        from tool import llm_config  # noqa: PLC0415
+
         llm_config()
         return
 
@@ -227,6 +233,8 @@ def main() -> None:  # noqa: C901, PLR0911
 
     # 处理认证相关参数
     if args.login:
+        from tool import browser_login  # noqa: PLC0415
+
         browser_login()
         return
 
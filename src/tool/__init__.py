@@ -1,10 +1,16 @@
 """工具模块"""
 
-from .command_processor import is_command_safe, process_command
-from .oi_backend_init import backend_init
-from .oi_llm_config import llm_config
-from .oi_login import browser_login
-from .oi_select_agent import select_agent
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .command_processor import is_command_safe, process_command
+    from .oi_backend_init import backend_init
+    from .oi_llm_config import llm_config
+    from .oi_login import browser_login
+    from .oi_select_agent import select_agent
 
 __all__ = [
     "backend_init",
@@ -14,3 +20,24 @@ __all__ = [
     "process_command",
     "select_agent",
 ]
+
+# 导出名称到子模块的映射；子模块依赖 Textual、部署组件等较重的包，按需导入以缩短启动时间
+_LAZY_EXPORTS = {
+    "backend_init": ".oi_backend_init",
+    "browser_login": ".oi_login",
+    "is_command_safe": ".command_processor",
+    "llm_config": ".oi_llm_config",
+    "process_command": ".command_processor",
+    "select_agent": ".oi_select_agent",
+}
+
+
+def __getattr__(name: str) -> object:
+    """首次访问导出名称时再导入对应子模块"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -5,6 +5,8 @@ HTTP 回调服务器
 通过本地 HTML 页面启动浏览器登录，并接收 postMessage 传递的 sessionId
 """
 
+import asyncio
+import contextlib
 import socket
 import socketserver
 import threading
@@ -24,6 +26,9 @@ class CallbackHandler(BaseHTTPRequestHandler):
     auth_result: ClassVar[dict] = {}
     auth_event: ClassVar[threading.Event] = threading.Event()
     auth_url: ClassVar[str] = ""  # 存储授权 URL
+    # 异步等待者：在服务器线程中收到结果后，线程安全地唤醒事件循环中的 Future
+    auth_loop: ClassVar[asyncio.AbstractEventLoop | None] = None
+    auth_future: ClassVar[asyncio.Future[dict] | None] = None
 
     def do_GET(self) -> None:
         """处理 GET 请求"""
@@ -45,6 +50,7 @@ class CallbackHandler(BaseHTTPRequestHandler):
                 self._send_success_page()
                 # 设置事件，通知主线程认证完成
                 CallbackHandler.auth_event.set()
+                CallbackHandler._resolve_future(CallbackHandler.auth_result)
             else:
                 CallbackHandler.auth_result = {
                     "type": "error",
@@ -57,6 +63,22 @@ class CallbackHandler(BaseHTTPRequestHandler):
             self.send_response(404)
             self.end_headers()
 
+    @staticmethod
+    def _resolve_future(result: dict) -> None:
+        """在事件循环线程中设置异步等待者的结果"""
+        loop = CallbackHandler.auth_loop
+        future = CallbackHandler.auth_future
+        if loop is None or future is None:
+            return
+
+        def _set_result() -> None:
+            if not future.done():
+                future.set_result(result)
+
+        # 事件循环已关闭时无需通知
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(_set_result)
+
     def _send_launcher_page(self) -> None:
         """发送启动器页面，用于打开授权 URL 并接收 postMessage"""
         html = f"""
@@ -258,6 +280,7 @@ class CallbackServer:
         self.port = None
         self.server = None
         self.thread = None
+        self.auth_future: asyncio.Future[dict] | None = None
 
     def _find_available_port(self) -> int:
         """
@@ -288,6 +311,8 @@ class CallbackServer:
         """
         启动服务器，返回 launcher URL
 
+        服务器已在运行时只重置认证状态并复用现有端口，重复登录无需重新绑定端口和创建线程。
+
         Args:
             auth_url: 授权 URL（从后端获取）
 
@@ -300,6 +325,20 @@ class CallbackServer:
         CallbackHandler.auth_event.clear()
         CallbackHandler.auth_url = auth_url
 
+        # 在事件循环中启动时，创建供 wait_for_auth_async 等待的 Future
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        self.auth_future = loop.create_future() if loop else None
+        CallbackHandler.auth_loop = loop
+        CallbackHandler.auth_future = self.auth_future
+
+        if self.is_running:
+            launcher_url = f"http://127.0.0.1:{self.port}/launcher"
+            logger.info("复用已启动的回调服务器: %s", launcher_url)
+            return launcher_url
+
         # 查找可用端口
         self.port = self._find_available_port()
 
@@ -314,6 +353,11 @@ class CallbackServer:
         logger.info("回调服务器已启动: %s", launcher_url)
         return launcher_url
 
+    @property
+    def is_running(self) -> bool:
+        """服务器是否正在运行"""
+        return self.server is not None and self.thread is not None and self.thread.is_alive()
+
     def wait_for_auth(self, timeout: int = 300) -> dict:
         """
         等待接收认证结果
@@ -334,6 +378,31 @@ class CallbackServer:
 
         return CallbackHandler.auth_result
 
+    async def wait_for_auth_async(self, timeout: float = 300) -> dict:  # noqa: ASYNC109
+        """
+        异步等待接收认证结果
+
+        与 wait_for_auth 相同，但直接等待事件循环中的 Future，不占用工作线程。
+        必须在事件循环中调用 start 之后使用。
+
+        Args:
+            timeout: 超时时间(秒)，默认 5 分钟
+
+        Returns:
+            认证结果字典
+
+        """
+        if self.auth_future is None:
+            msg = "回调服务器未在事件循环中启动"
+            raise RuntimeError(msg)
+
+        logger.info("等待用户完成登录...")
+        try:
+            return await asyncio.wait_for(self.auth_future, timeout=timeout)
+        except TimeoutError:
+            logger.error("等待登录超时")  # noqa: TRY400
+            return {"type": "error", "error": "timeout", "error_description": "登录超时"}
+
     def stop(self) -> None:
         """停止服务器"""
         if self.server:
@@ -342,4 +411,6 @@ class CallbackServer:
             self.server.server_close()
             if self.thread:
                 self.thread.join(timeout=2)
+            self.server = None
+            self.thread = None
             logger.info("回调服务器已关闭")
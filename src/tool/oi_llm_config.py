@@ -11,11 +11,12 @@ import contextlib
 import os
 import subprocess
 import sys
+import tomllib
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
-import toml
+import tomli_w
 from textual import on
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
@@ -128,7 +129,7 @@ class LLMSystemConfig:
                 filename=e.filename if hasattr(e, "filename") else "",
             )
             raise PermissionError(error_msg) from e
-        except (OSError, ValueError, toml.TomlDecodeError):
+        except (OSError, ValueError, tomllib.TOMLDecodeError):
             logger.exception("加载系统配置失败")
             raise
 
@@ -160,7 +161,7 @@ class LLMSystemConfig:
 
             logger.info("系统配置保存成功")
 
-        except (OSError, ValueError, toml.TomlDecodeError):
+        except (OSError, ValueError, tomllib.TOMLDecodeError):
             logger.exception("保存系统配置失败")
             raise
 
@@ -227,7 +228,7 @@ class LLMSystemConfig:
             self.llm.endpoint,
             self.llm.api_key,
             self.llm.model,
-            300,  # 使用默认超时时间 300 秒
+            self.llm.probe_timeout_s,
             self.llm.max_tokens,  # 传递最大令牌数
             self.llm.temperature,  # 传递温度参数
         )
@@ -254,7 +255,7 @@ class LLMSystemConfig:
             self.embedding.endpoint,
             self.embedding.api_key,
             self.embedding.model,
-            300,  # 使用默认超时时间 300 秒
+            self.embedding.probe_timeout_s,
         )
 
         # 如果验证成功，保存检测到的 embedding 类型
@@ -272,8 +273,8 @@ class LLMSystemConfig:
         最高优先级，覆盖其他配置
         """
         try:
-            with self.FRAMEWORK_CONFIG_PATH.open(encoding="utf-8") as f:
-                data = toml.load(f)
+            with self.FRAMEWORK_CONFIG_PATH.open("rb") as f:
+                data = tomllib.load(f)
 
             # 加载 LLM 配置
             self._load_llm_config_from_toml(data)
@@ -284,7 +285,7 @@ class LLMSystemConfig:
         except PermissionError:
             logger.exception("权限不足，无法读取 TOML 配置文件")
             raise
-        except (OSError, toml.TomlDecodeError):
+        except (OSError, tomllib.TOMLDecodeError):
             logger.exception("从 TOML 文件加载配置失败")
             raise
 
@@ -362,8 +363,8 @@ class LLMSystemConfig:
         """保存配置到 TOML 文件"""
         try:
             # 读取现有配置
-            with self.FRAMEWORK_CONFIG_PATH.open(encoding="utf-8") as f:
-                data = toml.load(f)
+            with self.FRAMEWORK_CONFIG_PATH.open("rb") as f:
+                data = tomllib.load(f)
 
             # 更新 LLM 配置
             if "llm" not in data:
@@ -405,10 +406,10 @@ class LLMSystemConfig:
             )
 
             # 写回文件
-            with self.FRAMEWORK_CONFIG_PATH.open("w", encoding="utf-8") as f:
-                toml.dump(data, f)
+            with self.FRAMEWORK_CONFIG_PATH.open("wb") as f:
+                tomli_w.dump(data, f)
 
-        except (OSError, toml.TomlDecodeError):
+        except (OSError, tomllib.TOMLDecodeError):
             logger.exception("保存到 TOML 文件失败")
             raise
 
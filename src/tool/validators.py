@@ -117,7 +117,7 @@ class APIValidator:
         endpoint: str,
         api_key: str,
         model: str,
-        timeout: int = 30,  # noqa: ASYNC109
+        timeout: float = 30,  # noqa: ASYNC109
         max_tokens: int | None = None,
         temperature: float | None = None,
     ) -> tuple[bool, str, dict[str, Any]]:
@@ -191,7 +191,7 @@ class APIValidator:
         endpoint: str,
         api_key: str,
         model: str,
-        timeout: int = 30,  # noqa: ASYNC109
+        timeout: float = 30,  # noqa: ASYNC109
     ) -> tuple[bool, str, dict[str, Any]]:
         """
         验证 Embedding 配置
@@ -235,7 +235,7 @@ class APIValidator:
         *,
         endpoint: str,
         api_key: str,
-        timeout: int,
+        timeout: float,
     ) -> AsyncOpenAI:
         """构造 AsyncOpenAI 客户端，应用统一的 SSL 校验设置"""
         http_client = httpx.AsyncClient(timeout=timeout, verify=self.verify_ssl)
@@ -595,7 +595,7 @@ FUNCTION_CALL: get_current_time()
         endpoint: str,
         api_key: str,
         model: str,
-        timeout: int = 30,  # noqa: ASYNC109
+        timeout: float = 30,  # noqa: ASYNC109
     ) -> tuple[bool, str, dict[str, Any]]:
         """验证 OpenAI 格式的 embedding 配置"""
         try:
@@ -639,7 +639,7 @@ FUNCTION_CALL: get_current_time()
         self,
         endpoint: str,
         api_key: str,
-        timeout: int = 30,  # noqa: ASYNC109
+        timeout: float = 30,  # noqa: ASYNC109
     ) -> tuple[bool, str, dict[str, Any]]:
         """验证 MindIE (TEI) 格式的 embedding 配置"""
         try:
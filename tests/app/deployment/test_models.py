@@ -0,0 +1,105 @@
+"""测试部署配置数据模型"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import tool.validators  # noqa: F401  # 直接导入 validators，避免通过 tool.__init__.py 产生循环导入
+from app.deployment.models import DeploymentConfig, DeploymentState
+
+
+class TestDeploymentStateLog(unittest.TestCase):
+    """测试部署日志的颜色转换"""
+
+    def test_add_log_converts_ansi_colors(self) -> None:
+        """测试 ANSI 颜色码被转换为 Rich 标记"""
+        state = DeploymentState()
+        state.add_log("\033[32mok\033[0m and \033[0;34minfo")
+
+        self.assertEqual(state.output_log[-1], "[green]ok[/] and [blue]info[/]")
+
+    def test_add_log_drops_orphan_close_tag(self) -> None:
+        """测试孤立的重置颜色码被移除"""
+        state = DeploymentState()
+        state.add_log("\033[0mdone \033[31mfailed")
+
+        self.assertEqual(state.output_log[-1], "done [red]failed[/]")
+
+    def test_add_log_skips_duplicate(self) -> None:
+        """测试连续重复的日志只保留一条"""
+        state = DeploymentState()
+        state.add_log("same")
+        state.add_log("same")
+
+        self.assertEqual(list(state.output_log), ["same"])
+
+    def test_drain_new_logs_returns_each_entry_once(self) -> None:
+        """测试增量读取返回两次读取之间新增的全部日志"""
+        state = DeploymentState()
+        state.add_log("first")
+        state.add_log("second")
+
+        self.assertEqual(state.drain_new_logs(), ["first", "second"])
+        self.assertEqual(state.drain_new_logs(), [])
+
+        state.add_log("third")
+        self.assertEqual(state.drain_new_logs(), ["third"])
+
+    def test_drain_new_logs_after_clear(self) -> None:
+        """测试清空日志后重新开始增量读取"""
+        state = DeploymentState()
+        state.add_log("old")
+        state.clear_log()
+        state.add_log("new")
+
+        self.assertEqual(state.drain_new_logs(), ["new"])
+
+
+class TestDeploymentConfigProbeCache(unittest.TestCase):
+    """测试连接性验证结果缓存"""
+
+    def test_successful_probe_is_cached(self) -> None:
+        """测试参数未变化时复用成功的验证结果"""
+        config = DeploymentConfig()
+        config.llm.endpoint = "http://127.0.0.1:1234/v1"
+        validator = AsyncMock()
+        validator.validate_llm_config.return_value = (True, "ok", {})
+
+        with patch.object(DeploymentConfig, "_validator", validator):
+            asyncio.run(config.validate_llm_connectivity())
+            asyncio.run(config.validate_llm_connectivity())
+
+        self.assertEqual(validator.validate_llm_config.await_count, 1)
+
+    def test_failed_probe_is_not_cached(self) -> None:
+        """测试失败的验证结果不会被缓存"""
+        config = DeploymentConfig()
+        config.llm.endpoint = "http://127.0.0.1:1234/v1"
+        validator = AsyncMock()
+        validator.validate_llm_config.return_value = (False, "error", {})
+
+        with patch.object(DeploymentConfig, "_validator", validator):
+            asyncio.run(config.validate_llm_connectivity())
+            asyncio.run(config.validate_llm_connectivity())
+
+        self.assertEqual(validator.validate_llm_config.await_count, 2)
+
+    def test_validate_connectivity_all(self) -> None:
+        """测试并发验证返回 LLM 与 Embedding 两组结果"""
+        config = DeploymentConfig()
+        config.llm.endpoint = "http://127.0.0.1:1234/v1"
+        config.embedding.endpoint = "http://127.0.0.1:1234/v1"
+        validator = AsyncMock()
+        validator.validate_llm_config.return_value = (True, "llm ok", {})
+        validator.validate_embedding_config.return_value = (True, "embedding ok", {"type": "mindie"})
+
+        with patch.object(DeploymentConfig, "_validator", validator):
+            llm_result, embed_result = asyncio.run(config.validate_connectivity_all())
+
+        self.assertEqual(llm_result[1], "llm ok")
+        self.assertEqual(embed_result[1], "embedding ok")
+        self.assertEqual(config.embedding.type, "mindie")
+
+
+if __name__ == "__main__":
+    unittest.main()
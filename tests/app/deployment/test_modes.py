@@ -0,0 +1,41 @@
+"""测试初始化模式选择界面"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+
+import tool.validators  # noqa: F401  # 直接导入 validators，避免通过 tool.__init__.py 产生循环导入
+from app.deployment.components.modes import ConnectExistingServiceScreen
+
+
+class TestConnectExistingServiceScreen(unittest.TestCase):
+    """测试连接现有服务屏幕"""
+
+    def test_connect_stops_callback_server(self) -> None:
+        """测试连接成功退出前停止回调服务器"""
+        screen = ConnectExistingServiceScreen()
+        screen.is_validated = True
+        screen._last_validated_inputs = ("http://127.0.0.1:8002", "session-id")  # noqa: SLF001
+        app = MagicMock()
+
+        async def run() -> None:
+            screen.callback_server.start("http://127.0.0.1:8002/login")
+            self.assertTrue(screen.callback_server.is_running)
+            await screen.on_connect_pressed()
+
+        with (
+            patch.object(ConnectExistingServiceScreen, "app", new_callable=PropertyMock, return_value=app),
+            patch.object(screen, "_save_configuration", AsyncMock()),
+            patch.object(screen, "notify"),
+        ):
+            try:
+                asyncio.run(run())
+            finally:
+                screen.callback_server.stop()
+
+        self.assertFalse(screen.callback_server.is_running)
+        app.exit.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,410 @@
+"""测试部署服务模块"""
+
+import asyncio
+import sys
+import tempfile
+import tomllib
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+import tool.validators  # noqa: F401  # 直接导入 validators，避免通过 tool.__init__.py 产生循环导入
+from app.deployment.models import DeploymentConfig, DeploymentState, EmbeddingConfig, LLMConfig
+from app.deployment.service import (
+    DeploymentResourceManager,
+    DeploymentService,
+    _parse_os_release,
+    _ProgressThrottle,
+)
+
+ENV_TEMPLATE = """# LLM
+MODEL_NAME = deepseek-llm-7b-chat
+OPENAI_API_BASE = http://10.50.88.44:11434/v1
+OPENAI_API_KEY=sk-123456
+REQUEST_TIMEOUT = 300
+MAX_TOKENS = 8192
+TEMPERATURE = 0.07
+# Embedding
+EMBEDDING_TYPE = openai
+EMBEDDING_API_KEY = sk-123456
+EMBEDDING_ENDPOINT = http://10.50.88.44:11434/v1
+EMBEDDING_MODEL_NAME = bge-m3"""
+
+TOML_TEMPLATE = """[fastapi]
+domain = "example.com"
+
+[llm]
+endpoint = ""
+key = ""
+model = ""
+max_tokens = 8192
+temperature = 0.7
+"""
+
+
+class TestUpdateConfigValues(unittest.TestCase):
+    """测试 env 配置文件内容更新"""
+
+    def setUp(self) -> None:
+        """准备部署配置"""
+        self.config = DeploymentConfig(
+            llm=LLMConfig(
+                endpoint="http://127.0.0.1:1234/v1",
+                api_key="key\\1",
+                model="qwen3",
+                max_tokens=4096,
+                temperature=0.5,
+                request_timeout=60,
+            ),
+            embedding=EmbeddingConfig(
+                type="mindie",
+                endpoint="http://127.0.0.1:1235/v1",
+                api_key="embed-key",
+                model="bge-large",
+            ),
+        )
+
+    def test_replaces_values_and_keeps_layout(self) -> None:
+        """测试替换配置值，同时保留键名格式、注释与行尾"""
+        result = DeploymentResourceManager.update_config_values(ENV_TEMPLATE, self.config)
+
+        self.assertEqual(
+            result.splitlines(),
+            [
+                "# LLM",
+                "MODEL_NAME = qwen3",
+                "OPENAI_API_BASE = http://127.0.0.1:1234/v1",
+                "OPENAI_API_KEY=key\\1",
+                "REQUEST_TIMEOUT = 60",
+                "MAX_TOKENS = 4096",
+                "TEMPERATURE = 0.5",
+                "# Embedding",
+                "EMBEDDING_TYPE = mindie",
+                "EMBEDDING_API_KEY = embed-key",
+                "EMBEDDING_ENDPOINT = http://127.0.0.1:1235/v1",
+                "EMBEDDING_MODEL_NAME = bge-large",
+            ],
+        )
+        self.assertFalse(result.endswith("\n"))
+
+    def test_unknown_keys_untouched(self) -> None:
+        """测试未知配置项保持不变"""
+        content = "OTHER_KEY = value\nMODEL_NAME_SUFFIX = keep\n"
+
+        result = DeploymentResourceManager.update_config_values(content, self.config)
+
+        self.assertEqual(result, content)
+
+
+class TestUpdateTomlValues(unittest.TestCase):
+    """测试 config.toml 配置文件内容更新"""
+
+    def test_repeated_updates_do_not_share_state(self) -> None:
+        """测试多次更新同一模板时，前一次的配置不会残留到后一次结果中"""
+        first = DeploymentConfig(llm=LLMConfig(endpoint="http://first/v1", model="first"))
+        second = DeploymentConfig(llm=LLMConfig(endpoint="http://second/v1"))
+
+        DeploymentResourceManager.update_toml_values(TOML_TEMPLATE, first)
+        result = tomllib.loads(DeploymentResourceManager.update_toml_values(TOML_TEMPLATE, second))
+
+        self.assertEqual(result["llm"]["endpoint"], "http://second/v1")
+        self.assertEqual(result["llm"]["model"], "")
+        self.assertEqual(result["fastapi"]["domain"], "127.0.0.1")
+
+    def test_untouched_lines_are_preserved(self) -> None:
+        """测试只改写目标键所在行，注释与其他配置保持原样"""
+        content = "# 部署配置\n[deploy]\nmode = 'local'  # 部署方式\n\n" + TOML_TEMPLATE
+        config = DeploymentConfig(llm=LLMConfig(endpoint="http://127.0.0.1:1234/v1", api_key='key"1'))
+
+        result = DeploymentResourceManager.update_toml_values(content, config)
+
+        self.assertTrue(result.startswith("# 部署配置\n[deploy]\nmode = 'local'  # 部署方式\n"))
+        self.assertIn('domain = "127.0.0.1"\n', result)
+        self.assertEqual(tomllib.loads(result)["llm"]["key"], 'key"1')
+
+    def test_inline_comments_on_targeted_keys_are_preserved(self) -> None:
+        """测试改写目标键时保留其行内注释"""
+        content = (
+            "[llm]\n"
+            'endpoint = "a#b"  # 接口地址\n'
+            "key = '' # 密钥\n"
+            'model = ""\n'
+            "max_tokens = 8192   # 最大长度\n"
+            "temperature = 0.7\n"
+        )
+        config = DeploymentConfig(llm=LLMConfig(endpoint="http://127.0.0.1:1234/v1", max_tokens=4096))
+
+        result = DeploymentResourceManager.update_toml_values(content, config)
+
+        self.assertIn('endpoint = "http://127.0.0.1:1234/v1"  # 接口地址\n', result)
+        self.assertIn('key = "" # 密钥\n', result)
+        self.assertIn("max_tokens = 4096   # 最大长度\n", result)
+
+    def test_missing_key_falls_back_to_serialization(self) -> None:
+        """测试模板中缺少目标键时，回退为完整序列化并补齐该键"""
+        content = "[llm]\nendpoint = ''\n"
+        config = DeploymentConfig(llm=LLMConfig(endpoint="http://127.0.0.1:1234/v1", model="qwen3"))
+
+        result = tomllib.loads(DeploymentResourceManager.update_toml_values(content, config))
+
+        self.assertEqual(result["llm"]["endpoint"], "http://127.0.0.1:1234/v1")
+        self.assertEqual(result["llm"]["model"], "qwen3")
+
+    def test_template_without_target_tables_is_returned_as_is(self) -> None:
+        """测试模板中没有需要更新的表时，原样返回内容"""
+        content = "# 仅包含其他配置\n[deploy]\nmode = 'local'\n"
+
+        result = DeploymentResourceManager.update_toml_values(content, DeploymentConfig())
+
+        self.assertIs(result, content)
+
+
+class TestCheckInstallerAvailable(unittest.TestCase):
+    """测试安装器资源检查"""
+
+    def setUp(self) -> None:
+        """创建临时安装器目录"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        base = Path(self.tmp_dir.name)
+        resource = base / "5-resource"
+        self.paths = {
+            "INSTALLER_BASE_PATH": base,
+            "RESOURCE_PATH": resource,
+            "DEPLOY_SCRIPT": base / "deploy",
+            "ENV_TEMPLATE": resource / "env",
+            "CONFIG_TEMPLATE": resource / "config.toml",
+        }
+
+    def _check(self) -> bool:
+        with patch.multiple(DeploymentResourceManager, **self.paths):
+            return DeploymentResourceManager.check_installer_available()
+
+    def test_all_resources_present(self) -> None:
+        """测试资源齐全时返回 True"""
+        self.paths["RESOURCE_PATH"].mkdir()
+        for name in ("DEPLOY_SCRIPT", "ENV_TEMPLATE", "CONFIG_TEMPLATE"):
+            self.paths[name].touch()
+
+        self.assertTrue(self._check())
+
+    def test_missing_template(self) -> None:
+        """测试缺少配置模板时返回 False"""
+        self.paths["RESOURCE_PATH"].mkdir()
+        self.paths["DEPLOY_SCRIPT"].touch()
+        self.paths["ENV_TEMPLATE"].touch()
+
+        self.assertFalse(self._check())
+
+    def test_missing_resource_dir(self) -> None:
+        """测试资源目录不存在时返回 False"""
+        self.paths["DEPLOY_SCRIPT"].touch()
+
+        self.assertFalse(self._check())
+
+
+class TestCheckSudoPrivileges(unittest.TestCase):
+    """测试 sudo 权限检查"""
+
+    def _run_checks(self, return_code: int) -> tuple[list[bool], AsyncMock]:
+        process = MagicMock()
+        process.wait = AsyncMock(return_value=return_code)
+        spawn = AsyncMock(return_value=process)
+        service = DeploymentService()
+
+        async def run() -> list[bool]:
+            return [await service.check_sudo_privileges(), await service.check_sudo_privileges()]
+
+        with patch("asyncio.create_subprocess_exec", spawn):
+            results = asyncio.run(run())
+        return results, spawn
+
+    def test_success_is_cached(self) -> None:
+        """测试检查通过后不再重复启动 sudo 进程"""
+        results, spawn = self._run_checks(0)
+
+        self.assertEqual(results, [True, True])
+        self.assertEqual(spawn.await_count, 1)
+
+    def test_failure_is_rechecked(self) -> None:
+        """测试检查失败时下次会重新检查"""
+        results, spawn = self._run_checks(1)
+
+        self.assertEqual(results, [False, False])
+        self.assertEqual(spawn.await_count, 2)
+
+
+class TestSudoKeepalive(unittest.TestCase):
+    """测试部署期间的 sudo 凭据刷新"""
+
+    def test_refreshes_while_active_and_stops_after(self) -> None:
+        """测试上下文期间以非交互方式刷新凭据，退出后停止刷新"""
+        process = MagicMock()
+        process.wait = AsyncMock(return_value=0)
+        spawn = AsyncMock(return_value=process)
+        service = DeploymentService()
+
+        async def run() -> None:
+            async with service._sudo_keepalive():  # noqa: SLF001
+                await asyncio.sleep(0.05)
+
+        with (
+            patch("app.deployment.service.SUDO_REFRESH_INTERVAL", 0.01),
+            patch("asyncio.create_subprocess_exec", spawn),
+        ):
+            asyncio.run(run())
+            calls_after_exit = spawn.await_count
+
+        self.assertGreater(calls_after_exit, 0)
+        self.assertEqual(spawn.await_args.args, ("sudo", "-n", "-v"))
+        self.assertIsNone(service._sudo_refresh_task)  # noqa: SLF001
+
+
+class TestFrameworkApiHealth(unittest.TestCase):
+    """测试服务 API 健康检查"""
+
+    def test_backoff_until_ready(self) -> None:
+        """测试连接失败时等待间隔指数增长，服务就绪后立即返回"""
+        request = httpx.Request("GET", "http://127.0.0.1:8002/api/user")
+        get = AsyncMock(
+            side_effect=[
+                httpx.ConnectError("refused", request=request),
+                httpx.ConnectError("refused", request=request),
+                httpx.ReadTimeout("timeout", request=request),
+                httpx.Response(200, request=request),
+            ],
+        )
+        sleep = AsyncMock()
+        service = DeploymentService()
+
+        with patch.object(httpx.AsyncClient, "get", get), patch("asyncio.sleep", sleep):
+            ready = asyncio.run(service._check_framework_api_health("127.0.0.1", 8002, None))  # noqa: SLF001
+
+        self.assertTrue(ready)
+        self.assertEqual([call.args[0] for call in sleep.await_args_list], [1.0, 2.0, 6.0])
+
+
+class TestCheckAndStopOldService(unittest.TestCase):
+    """测试部署前停止旧服务"""
+
+    def _run(self, is_active_output: bytes) -> AsyncMock:
+        status_process = MagicMock(returncode=0)
+        status_process.communicate = AsyncMock(return_value=(is_active_output, b""))
+        stop_process = MagicMock(returncode=0)
+        stop_process.communicate = AsyncMock(return_value=(b"", b""))
+        spawn = AsyncMock(side_effect=[status_process, stop_process])
+
+        with patch("asyncio.create_subprocess_exec", spawn):
+            result = asyncio.run(DeploymentService()._check_and_stop_old_service(None))  # noqa: SLF001
+
+        self.assertTrue(result)
+        return spawn
+
+    def test_stops_only_active_services_in_one_call(self) -> None:
+        """测试一次查询全部服务状态，并只停止运行中的服务"""
+        spawn = self._run(b"inactive\nactive\n")
+
+        self.assertEqual(spawn.await_args_list[0].args, ("systemctl", "is-active", "oi-runtime", "oi-rag"))
+        self.assertEqual(spawn.await_args_list[1].args, ("sudo", "systemctl", "stop", "oi-rag"))
+
+    def test_nothing_to_stop(self) -> None:
+        """测试没有运行中的服务时不执行停止命令"""
+        spawn = self._run(b"inactive\nfailed\n")
+
+        self.assertEqual(spawn.await_count, 1)
+
+
+class TestProgressThrottle(unittest.TestCase):
+    """测试进度回调限流"""
+
+    def test_burst_is_merged_and_flushed_later(self) -> None:
+        """测试同一步骤内的密集回调被合并，并在间隔结束后补发"""
+        callback = MagicMock()
+        state = DeploymentState()
+
+        async def run() -> int:
+            throttle = _ProgressThrottle(callback)
+            for _ in range(10):
+                throttle(state)
+            calls_in_burst = callback.call_count
+            await asyncio.sleep(0.2)
+            return calls_in_burst
+
+        calls_in_burst = asyncio.run(run())
+
+        self.assertEqual(calls_in_burst, 1)
+        self.assertEqual(callback.call_count, 2)
+
+    def test_step_change_emits_immediately(self) -> None:
+        """测试步骤切换时立即回调"""
+        callback = MagicMock()
+        state = DeploymentState()
+
+        async def run() -> None:
+            throttle = _ProgressThrottle(callback)
+            throttle(state)
+            state.current_step = 1
+            throttle(state)
+            throttle.flush()
+
+        asyncio.run(run())
+
+        self.assertEqual(callback.call_count, 2)
+
+
+class TestReadProcessOutputLines(unittest.TestCase):
+    """测试子进程输出的逐行读取"""
+
+    def test_yields_stripped_lines(self) -> None:
+        """测试按行输出，跳过空行并保留不以换行符结尾的最后一行"""
+
+        async def run() -> list[str]:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-c",
+                "import sys; sys.stdout.write('  第一行\\n\\n第二行  \\r\\n末尾')",
+                stdout=asyncio.subprocess.PIPE,
+            )
+            lines = [line async for line in DeploymentService()._read_process_output_lines(process)]  # noqa: SLF001
+            await process.wait()
+            return lines
+
+        self.assertEqual(asyncio.run(run()), ["第一行", "第二行", "末尾"])
+
+
+class TestExecuteInstallCommand(unittest.TestCase):
+    """测试安装命令输出的进度回调"""
+
+    def test_output_burst_is_throttled_and_flushed(self) -> None:
+        """测试密集输出只触发少量回调，且全部输出行都记入日志"""
+        state = DeploymentState()
+        callback = MagicMock()
+        cmd = [sys.executable, "-c", "for i in range(100): print(f'line {i}', flush=True)"]
+
+        success, output_lines = asyncio.run(
+            DeploymentService()._execute_install_command(cmd, callback, state),  # noqa: SLF001
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(len(output_lines), 100)
+        self.assertLess(callback.call_count, 5)
+        self.assertEqual(len(state.drain_new_logs()), 100)
+
+
+class TestParseOsRelease(unittest.TestCase):
+    """测试 os-release 解析"""
+
+    def test_parses_quoted_values_and_skips_comments(self) -> None:
+        """测试解析带引号的值，并跳过注释与空行"""
+        content = '# comment\nNAME="openEuler"\n\nID=openeuler\nID_LIKE=\'rhel fedora\'\nVERSION_ID="24.03"\n'
+
+        self.assertEqual(
+            _parse_os_release(content),
+            {"NAME": "openEuler", "ID": "openeuler", "ID_LIKE": "rhel fedora", "VERSION_ID": "24.03"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
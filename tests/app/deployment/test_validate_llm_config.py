@@ -80,9 +80,8 @@ async def main() -> None:
     _output("\n🌐 步骤 2: API 连接性验证")
     _output("⚠️  注意: 需要有效的 API 密钥才能通过此步骤")
     try:
-        # 分别验证 LLM 和 Embedding 配置
-        llm_valid, llm_msg, llm_info = await config.validate_llm_connectivity()
-        embed_valid, embed_msg, embed_info = await config.validate_embedding_connectivity()
+        # 并发验证 LLM 和 Embedding 配置
+        (llm_valid, llm_msg, llm_info), (embed_valid, embed_msg, embed_info) = await config.validate_connectivity_all()
 
         api_valid = llm_valid and embed_valid
         api_errors = []
@@ -1,7 +1,9 @@
 """测试登录功能模块"""
 
+import asyncio
 import json
 import unittest
+import urllib.request
 from unittest.mock import MagicMock, Mock, patch
 
 from tool.callback_server import CallbackServer
@@ -101,6 +103,56 @@ class TestCallbackServer(unittest.TestCase):
 
         self.assertIn("无法找到可用端口", str(context.exception))
 
+    def test_start_reuses_running_server(self) -> None:
+        """测试重复启动时复用已运行的服务器"""
+        server = CallbackServer(start_port=18081)
+        try:
+            first_url = server.start("https://auth.example.com/first")
+            first_thread = server.thread
+
+            second_url = server.start("https://auth.example.com/second")
+
+            self.assertEqual(first_url, second_url)
+            self.assertIs(server.thread, first_thread)
+            self.assertTrue(server.is_running)
+        finally:
+            server.stop()
+
+        self.assertFalse(server.is_running)
+
+    def test_wait_for_auth_async_receives_session(self) -> None:
+        """测试异步等待接收到回调中的 sessionId"""
+
+        async def run() -> dict:
+            server = CallbackServer(start_port=18101)
+            try:
+                launcher_url = server.start("https://auth.example.com/login")
+                callback_url = launcher_url.replace("/launcher", "/callback?sessionId=abc")
+                waiter = asyncio.create_task(server.wait_for_auth_async(timeout=5))
+                await asyncio.to_thread(lambda: urllib.request.urlopen(callback_url, timeout=5).read())  # noqa: S310
+                return await waiter
+            finally:
+                server.stop()
+
+        result = asyncio.run(run())
+
+        self.assertEqual(result, {"type": "session", "sessionId": "abc"})
+
+    def test_wait_for_auth_async_timeout(self) -> None:
+        """测试异步等待超时返回错误结果"""
+
+        async def run() -> dict:
+            server = CallbackServer(start_port=18121)
+            try:
+                server.start("https://auth.example.com/login")
+                return await server.wait_for_auth_async(timeout=0.05)
+            finally:
+                server.stop()
+
+        result = asyncio.run(run())
+
+        self.assertEqual(result["error"], "timeout")
+
 
 if __name__ == "__main__":
     unittest.main()